@@ -23,10 +23,12 @@ daq.set_gain1(0)  # CH1 gain index = 0
 # Sampling rate
 daq.set_freq(50_000)
 
-# Measure a snapshot with average of 5 frames 
-print("Snapshot 5 frames (mV):", daq.snapshot_mV(5)[0]) # Output in mV 
+# Measure a snapshot with average of 5 frames
+# One call returns both values - don't acquire twice
+mv, gains = daq.snapshot_mV(5)
+print("Snapshot 5 frames (mV):", mv) # Output in mV
 
-print("Gains : ", daq.snapshot_mV(5)[1]) # Returns current gain indices
+print("Gains : ", gains) # Returns current gain indices
 
 print("Snapshot 5 frames (Watts):", daq.snapshot_W(5)) # Output in Watts
 
@@ -1,5 +1,5 @@
-from matplotlib import use
 from coredaq_py_api import CoreDAQ
+import threading
 import time
 
 daq = CoreDAQ("/dev/tty.usbmodem2057396453331") # Set your CoreDAQ port here
@@ -23,7 +23,14 @@ daq.start_acquisition() #Start Acquisition
 
 start=time.time()
 
-time.sleep(NUM_SAMPLES/SAMPLING_RATE + 0.5 )  # wait for acquisition to complete
+# Event-driven wait: a watcher thread signals as soon as the device is
+# ready (the first poll is deferred by the nominal capture time, so the
+# serial link stays idle during the acquisition). In a GUI the callback
+# would post a signal instead of setting an Event.
+done = threading.Event()
+daq.notify_when_done(done.set, poll_s=0.002, delay_s=NUM_SAMPLES / SAMPLING_RATE, timeout_s=5.0)
+if not done.wait(timeout=NUM_SAMPLES / SAMPLING_RATE + 5.0):
+    raise TimeoutError("Acquisition did not complete in time")
 
 end = time.time()
 
@@ -31,7 +38,8 @@ print(f"Acquired 100_000 frames in {end-start:.2f} seconds")
 
 ch = daq.transfer_frames_W(NUM_SAMPLES) # Dump acquired frames in Watts
 
-#Data strucutre is a list of 4 lists, each containing the samples for that channel
+#Data structure is a (4, N) float32 array, one row of samples per channel
+#(backed by a reusable buffer - copy it if you keep data across transfers)
 print("Ch1 first 5 samples (W):", ch[0][:5])
 print("Ch2 first 5 samples (W):", ch[1][:5])
 print("Ch3 first 5 samples (W):", ch[2][:5])
@@ -44,9 +44,8 @@ print(f"Sampling frequency: {daq.get_freq_hz()} Hz")
 # ----------------------------------------------------------------------
 # Read environmental sensors # CoreDAQ is equipped with temp/humidity sensors
 # ----------------------------------------------------------------------
-T_ambient = daq.get_head_temperature_C()
-RH = daq.get_head_humidity()
-T_die = daq.get_die_temperature_C()
+# One composite query = one USB round-trip for all three sensors
+T_ambient, RH, T_die = daq.get_env()
 
 print(f"Ambient temperature : {T_ambient:.2f} °C")
 print(f"Ambient humidity    : {RH:.1f} %")
@@ -1,309 +1,609 @@
-# channels.py
-from __future__ import annotations
-
-from dataclasses import dataclass
-from typing import List, Optional, Tuple, Dict, Any, Iterable
-
-import numpy as np
-from PyQt5 import QtCore, QtWidgets
-
-
-# -------------------------------------------------------------------
-# Channel config dataclass
-# -------------------------------------------------------------------
-
-@dataclass
-class ChannelConfig:
-    """
-    Generic channel configuration.
-
-    kind:
-      - "physical"   -> direct CoreDAQ channel (index 0..3)
-      - "math"       -> math expression based on ch1..ch4
-      - "relative"   -> 10*log10(ch_num/ch_den) in dB
-    """
-    name: str
-    kind: str  # "physical", "math", "relative"
-    unit: str = "W"
-    index: Optional[int] = None                  # for physical channels: 0..3
-    expression: Optional[str] = None             # for math channels
-    rel_src_indices: Optional[Tuple[int, int]] = None  # (num, den) for relative
-    enabled: bool = True                         # for physical channels
-
-
-# -------------------------------------------------------------------
-# Safe expression evaluation for math channels
-# -------------------------------------------------------------------
-
-_SAFE_FUNCS: Dict[str, Any] = {
-    "abs": np.abs,
-    "sin": np.sin,
-    "cos": np.cos,
-    "tan": np.tan,
-    "exp": np.exp,
-    "log": np.log,
-    "log10": np.log10,
-    "sqrt": np.sqrt,
-    "maximum": np.maximum,
-    "minimum": np.minimum,
-}
-
-
-def safe_eval_expression(expr: str, context: Dict[str, Any]) -> Any:
-    """
-    Very small wrapper around eval with a restricted namespace.
-
-    'context' typically contains:
-        ch1, ch2, ch3, ch4 : scalars or numpy arrays (in W)
-    """
-    allowed = dict(_SAFE_FUNCS)
-    allowed.update(context)
-    return eval(expr, {"__builtins__": {}}, allowed)
-
-
-# -------------------------------------------------------------------
-# Channel manager
-# -------------------------------------------------------------------
-
-class ChannelManager:
-    """
-    Holds physical, math and relative channels and their enabled state.
-    """
-
-    def __init__(self) -> None:
-        # 4 physical channels by default
-        self.physical_channels: List[ChannelConfig] = [
-            ChannelConfig(
-                name=f"Channel {i+1}",
-                kind="physical",
-                unit="W",
-                index=i,
-                enabled=True,
-            )
-            for i in range(4)
-        ]
-
-        self.math_channels: List[ChannelConfig] = []
-        self.relative_channels: List[ChannelConfig] = []
-
-    # --- Physical enable/disable ---
-
-    def is_physical_enabled(self, idx: int) -> bool:
-        if 0 <= idx < len(self.physical_channels):
-            return self.physical_channels[idx].enabled
-        return False
-
-    def set_physical_enabled(self, idx: int, enabled: bool) -> None:
-        if 0 <= idx < len(self.physical_channels):
-            self.physical_channels[idx].enabled = enabled
-
-    # --- Add math / relative ---
-
-    def add_math_channel(self, cfg: ChannelConfig) -> None:
-        cfg.kind = "math"
-        self.math_channels.append(cfg)
-
-    def add_relative_channel(self, cfg: ChannelConfig) -> None:
-        cfg.kind = "relative"
-        self.relative_channels.append(cfg)
-
-    # --- For UI / plotting ---
-
-    def get_display_channels(self) -> List[ChannelConfig]:
-        """
-        Order: enabled physical channels, then math, then relative.
-        """
-        chs: List[ChannelConfig] = [
-            c for c in self.physical_channels if c.enabled
-        ]
-        chs.extend(self.math_channels)
-        chs.extend(self.relative_channels)
-        return chs
-
-    # --- Evaluation helpers (scalar) ---
-
-    def eval_math_scalar(self, cfg: ChannelConfig, phys_values_W: Iterable[float]) -> float:
-        """
-        Evaluate math expression on current scalar physical values in W.
-        phys_values_W: length-4 iterable [ch1_W, ch2_W, ch3_W, ch4_W]
-        """
-        ch1, ch2, ch3, ch4 = phys_values_W
-        context = {
-            "ch1": ch1,
-            "ch2": ch2,
-            "ch3": ch3,
-            "ch4": ch4,
-        }
-        return float(safe_eval_expression(cfg.expression or "0", context))
-
-    def eval_relative_scalar(self, cfg: ChannelConfig, phys_values_W: Iterable[float]) -> float:
-        """
-        10*log10(ch_num/ch_den) with some safety.
-        """
-        ch1, ch2, ch3, ch4 = phys_values_W
-        arr = [ch1, ch2, ch3, ch4]
-        num_idx, den_idx = cfg.rel_src_indices or (0, 1)
-        num = float(arr[num_idx])
-        den = float(arr[den_idx])
-        if den <= 0 or num <= 0:
-            # effectively -inf, but clamp for display
-            return float("-inf")
-        return 10.0 * np.log10(num / den)
-
-    # --- Evaluation helpers (array) ---
-
-    def eval_math_array(self, cfg: ChannelConfig, phys_arrays_W: List[np.ndarray]) -> np.ndarray:
-        """
-        Evaluate math expression on arrays for sweep plots.
-        phys_arrays_W: [ch1_array, ch2_array, ch3_array, ch4_array] in W
-        """
-        ch1, ch2, ch3, ch4 = phys_arrays_W
-        context = {
-            "ch1": ch1,
-            "ch2": ch2,
-            "ch3": ch3,
-            "ch4": ch4,
-        }
-        return np.asarray(safe_eval_expression(cfg.expression or "0", context))
-
-    def eval_relative_array(self, cfg: ChannelConfig, phys_arrays_W: List[np.ndarray]) -> np.ndarray:
-        """
-        Relative transmission in dB on arrays for sweep plots.
-        """
-        ch1, ch2, ch3, ch4 = phys_arrays_W
-        num_idx, den_idx = cfg.rel_src_indices or (0, 1)
-        num = np.asarray([ch1, ch2, ch3, ch4][num_idx])
-        den = np.asarray([ch1, ch2, ch3, ch4][den_idx])
-        num = np.maximum(num, 1e-20)
-        den = np.maximum(den, 1e-20)
-        return 10.0 * np.log10(num / den)
-
-
-# -------------------------------------------------------------------
-# Math channel dialog
-# -------------------------------------------------------------------
-
-class MathChannelDialog(QtWidgets.QDialog):
-    """
-    Simple dialog for creating/editing a math channel.
-    User enters:
-      - Name (optional)
-      - Expression (required), e.g. "ch1 - ch2" or "10*log10(ch1/ch2)"
-      - Unit (optional)
-    """
-
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.setWindowTitle("Add Math Channel")
-
-        self.channel_name: str = ""
-        self.expression: str = ""
-        self.unit: str = ""
-
-        layout = QtWidgets.QFormLayout(self)
-
-        self.name_edit = QtWidgets.QLineEdit(self)
-        self.expr_edit = QtWidgets.QLineEdit(self)
-        self.unit_edit = QtWidgets.QLineEdit(self)
-
-        self.expr_edit.setPlaceholderText("e.g. ch1 - ch2 or 10*log10(ch1/ch2)")
-
-        layout.addRow("Name:", self.name_edit)
-        layout.addRow("Expression:", self.expr_edit)
-        layout.addRow("Unit:", self.unit_edit)
-
-        help_label = QtWidgets.QLabel(
-            "Variables: ch1, ch2, ch3, ch4 (in W)\n"
-            "Functions: sin, cos, exp, log, log10, sqrt, maximum, minimum, abs"
-        )
-        help_label.setWordWrap(True)
-        layout.addRow(help_label)
-
-        btn_box = QtWidgets.QDialogButtonBox(
-            QtWidgets.QDialogButtonBox.Ok | QtWidgets.QDialogButtonBox.Cancel,
-            QtCore.Qt.Horizontal,
-            self,
-        )
-        btn_box.accepted.connect(self._on_accept)
-        btn_box.rejected.connect(self.reject)
-        layout.addRow(btn_box)
-
-    def _on_accept(self):
-        self.channel_name = self.name_edit.text().strip()
-        self.expression = self.expr_edit.text().strip()
-        self.unit = self.unit_edit.text().strip()
-        if not self.expression:
-            QtWidgets.QMessageBox.warning(
-                self,
-                "Invalid expression",
-                "Expression cannot be empty.",
-            )
-            return
-        self.accept()
-
-
-# -------------------------------------------------------------------
-# Relative transmission dialog
-# -------------------------------------------------------------------
-
-class RelativeTransmissionDialog(QtWidgets.QDialog):
-    """
-    Dialog to define a relative transmission channel of the form:
-        10 * log10(Ch_num / Ch_den)
-    """
-
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.setWindowTitle("Add Relative Transmission Channel")
-
-        self.channel_name: str = ""
-        self.numerator_index: int = 0
-        self.denominator_index: int = 1
-
-        layout = QtWidgets.QFormLayout(self)
-
-        self.name_edit = QtWidgets.QLineEdit(self)
-
-        self.num_combo = QtWidgets.QComboBox(self)
-        self.den_combo = QtWidgets.QComboBox(self)
-
-        # We assume 4 physical channels (1..4)
-        for i in range(4):
-            self.num_combo.addItem(f"Channel {i+1}", i)
-            self.den_combo.addItem(f"Channel {i+1}", i)
-
-        self.num_combo.setCurrentIndex(0)
-        self.den_combo.setCurrentIndex(1)
-
-        layout.addRow("Name:", self.name_edit)
-        layout.addRow("Numerator:", self.num_combo)
-        layout.addRow("Denominator:", self.den_combo)
-
-        info = QtWidgets.QLabel("Result = 10·log10( Numerator / Denominator ) in dB")
-        layout.addRow(info)
-
-        btn_box = QtWidgets.QDialogButtonBox(
-            QtWidgets.QDialogButtonBox.Ok | QtWidgets.QDialogButtonBox.Cancel,
-            QtCore.Qt.Horizontal,
-            self,
-        )
-        btn_box.accepted.connect(self._on_accept)
-        btn_box.rejected.connect(self.reject)
-        layout.addRow(btn_box)
-
-    def _on_accept(self):
-        name = self.name_edit.text().strip()
-        self.channel_name = name
-
-        self.numerator_index = int(self.num_combo.currentData())
-        self.denominator_index = int(self.den_combo.currentData())
-
-        if self.numerator_index == self.denominator_index:
-            QtWidgets.QMessageBox.warning(
-                self,
-                "Invalid selection",
-                "Numerator and denominator must be different channels.",
-            )
-            return
-
-        self.accept()
+# channels.py
+from __future__ import annotations
+
+import ast
+
+from dataclasses import dataclass, field
+from functools import lru_cache
+from types import CodeType, MappingProxyType
+from math import log10
+from typing import List, Optional, Tuple, Dict, Any, Callable, Iterable
+
+import numpy as np
+from PyQt5 import QtCore, QtWidgets
+
+# Optional: numba fuses a math expression into a single compiled loop,
+# avoiding one N-sized temporary per NumPy ufunc on long sweeps.
+try:
+    import numba
+except Exception:  # pragma: no cover
+    numba = None  # type: ignore
+
+# Optional: numexpr evaluates a whole expression block-wise over
+# cache-sized tiles, keeping intermediates out of main memory.
+try:
+    import numexpr
+except Exception:  # pragma: no cover
+    numexpr = None  # type: ignore
+
+
+# -------------------------------------------------------------------
+# Channel config dataclass
+# -------------------------------------------------------------------
+
+@dataclass(slots=True)
+class ChannelConfig:
+    """
+    Generic channel configuration.
+
+    kind:
+      - "physical"   -> direct CoreDAQ channel (index 0..3)
+      - "math"       -> math expression based on ch1..ch4
+      - "relative"   -> 10*log10(ch_num/ch_den) in dB
+    """
+    name: str
+    kind: str  # "physical", "math", "relative"
+    unit: str = "W"
+    index: Optional[int] = None                  # for physical channels: 0..3
+    expression: Optional[str] = None             # for math channels
+    rel_src_indices: Optional[Tuple[int, int]] = None  # (num, den) for relative
+    enabled: bool = True                         # for physical channels
+    _code: Optional[CodeType] = field(default=None, repr=False, compare=False)  # compiled expression cache
+    _kernel: Optional[Callable] = field(default=None, repr=False, compare=False)  # fused numba kernel (or None)
+
+
+# -------------------------------------------------------------------
+# Safe expression evaluation for math channels
+# -------------------------------------------------------------------
+
+# read-only: shared by every evaluation, never mutated
+_SAFE_FUNCS: "MappingProxyType[str, Any]" = MappingProxyType({
+    "abs": np.abs,
+    "sin": np.sin,
+    "cos": np.cos,
+    "tan": np.tan,
+    "exp": np.exp,
+    "log": np.log,
+    "log10": np.log10,
+    "sqrt": np.sqrt,
+    "maximum": np.maximum,
+    "minimum": np.minimum,
+})
+
+
+_FORBIDDEN_NODES = (
+    ast.Attribute,
+    ast.Subscript,
+    ast.Lambda,
+    ast.Await,
+    ast.NamedExpr,
+    ast.Starred,
+    ast.comprehension,
+)
+
+
+def _validate_math_expr(tree: ast.Expression) -> None:
+    """
+    Reject expression constructs outside the math-channel whitelist.
+
+    Raises ValueError so an illegal expression fails at creation time
+    instead of raising deep inside NumPy on the first frame.
+    """
+    for node in ast.walk(tree):
+        if isinstance(node, _FORBIDDEN_NODES):
+            raise ValueError(
+                f"'{type(node).__name__}' is not allowed in channel expressions"
+            )
+        if isinstance(node, ast.Call):
+            if not (isinstance(node.func, ast.Name) and node.func.id in _SAFE_FUNCS):
+                raise ValueError("only whitelisted functions may be called")
+
+
+@lru_cache(maxsize=128)
+def _compile_expr(expr: str) -> CodeType:
+    """Validate and compile (and cache) a math channel expression."""
+    tree = ast.parse(expr, mode="eval")
+    _validate_math_expr(tree)
+    return compile(tree, "<chan>", "eval")
+
+
+def safe_eval_expression(expr: str, context: Dict[str, Any], code: Optional[CodeType] = None) -> Any:
+    """
+    Very small wrapper around eval with a restricted namespace.
+
+    'context' typically contains:
+        ch1, ch2, ch3, ch4 : scalars or numpy arrays (in W)
+
+    Expressions are compiled once and cached, so repeated evaluation
+    (per frame / per sweep refresh) only pays bytecode dispatch.
+    A pre-compiled 'code' object can be passed to skip the cache lookup.
+    """
+    allowed = {**_SAFE_FUNCS, **context}  # single C-level merge
+    return eval(code if code is not None else _compile_expr(expr), {"__builtins__": {}}, allowed)
+
+
+@lru_cache(maxsize=128)
+def linear_coeffs(expr: str) -> Optional[Tuple[float, float, float, float, float]]:
+    """
+    Try to lower a math expression to the affine form
+
+        a1*ch1 + a2*ch2 + a3*ch3 + a4*ch4 + b
+
+    Returns (a1, a2, a3, a4, b), or None when the expression is not a
+    plain linear combination (function calls, channel products,
+    division by a channel, ...). Callers can batch every lowered card
+    into one matrix product instead of evaluating them one by one.
+    """
+    try:
+        tree = ast.parse(expr, mode="eval")
+    except SyntaxError:
+        return None
+
+    def lin(node) -> np.ndarray:
+        # coefficient vector (a1..a4, b); ValueError marks non-linear
+        if isinstance(node, ast.Expression):
+            return lin(node.body)
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+            v = np.zeros(5)
+            v[4] = float(node.value)
+            return v
+        if isinstance(node, ast.Name) and node.id in _CHANNEL_NAMES:
+            v = np.zeros(5)
+            v[_CHANNEL_NAMES.index(node.id)] = 1.0
+            return v
+        if isinstance(node, ast.UnaryOp):
+            if isinstance(node.op, ast.USub):
+                return -lin(node.operand)
+            if isinstance(node.op, ast.UAdd):
+                return lin(node.operand)
+            raise ValueError
+        if isinstance(node, ast.BinOp):
+            if isinstance(node.op, ast.Add):
+                return lin(node.left) + lin(node.right)
+            if isinstance(node.op, ast.Sub):
+                return lin(node.left) - lin(node.right)
+            lv = lin(node.left)
+            rv = lin(node.right)
+            if isinstance(node.op, ast.Mult):
+                # one factor must be constant to stay linear
+                if not lv[:4].any():
+                    return rv * lv[4]
+                if not rv[:4].any():
+                    return lv * rv[4]
+                raise ValueError
+            if isinstance(node.op, ast.Div):
+                if not rv[:4].any() and rv[4] != 0.0:
+                    return lv / rv[4]
+                raise ValueError
+        raise ValueError
+
+    try:
+        vec = lin(tree)
+    except ValueError:
+        return None
+    return tuple(float(x) for x in vec)
+
+
+# -------------------------------------------------------------------
+# Optional fused kernels for math channels (numba)
+# -------------------------------------------------------------------
+
+_CHANNEL_NAMES = ("ch1", "ch2", "ch3", "ch4")
+
+# scalar equivalents usable inside an njit loop
+_KERNEL_FUNCS = {
+    "abs": "abs",
+    "sin": "math.sin",
+    "cos": "math.cos",
+    "tan": "math.tan",
+    "exp": "math.exp",
+    "log": "math.log",
+    "log10": "math.log10",
+    "sqrt": "math.sqrt",
+    "maximum": "max",
+    "minimum": "min",
+}
+
+_ALLOWED_OPS = (
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow, ast.Mod,
+    ast.UAdd, ast.USub,
+)
+
+
+def _expr_is_fusable(tree: ast.Expression) -> bool:
+    """True if the expression only uses whitelisted element-wise constructs."""
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.Expression, ast.BinOp, ast.UnaryOp, ast.Load)):
+            continue
+        if isinstance(node, _ALLOWED_OPS):
+            continue
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+            continue
+        if isinstance(node, ast.Name) and node.id in _CHANNEL_NAMES:
+            continue
+        if isinstance(node, ast.Call):
+            if (
+                isinstance(node.func, ast.Name)
+                and node.func.id in _KERNEL_FUNCS
+                and not node.keywords
+            ):
+                continue
+            return False
+        if isinstance(node, ast.Name) and node.id in _KERNEL_FUNCS:
+            continue
+        return False
+    return True
+
+
+class _ScalarizeTransformer(ast.NodeTransformer):
+    """Rewrite ch1 -> ch1[i] and maximum(...) -> max(...) etc."""
+
+    def visit_Name(self, node: ast.Name):
+        if node.id in _CHANNEL_NAMES:
+            return ast.copy_location(
+                ast.Subscript(
+                    value=ast.Name(id=node.id, ctx=ast.Load()),
+                    slice=ast.Name(id="i", ctx=ast.Load()),
+                    ctx=ast.Load(),
+                ),
+                node,
+            )
+        if node.id in _KERNEL_FUNCS:
+            return ast.copy_location(
+                ast.parse(_KERNEL_FUNCS[node.id], mode="eval").body, node
+            )
+        return node
+
+
+@lru_cache(maxsize=128)
+def _build_math_kernel(expr: str) -> Optional[Callable]:
+    """
+    Compile a math channel expression into a single fused numba loop:
+
+        def _k(ch1, ch2, ch3, ch4, out):
+            for i in range(out.size):
+                out[i] = <scalarized expr>
+
+    Returns None when numba is unavailable or the expression uses
+    constructs we cannot scalarize; callers then fall back to the
+    NumPy eval path.
+    """
+    if numba is None:
+        return None
+    try:
+        tree = ast.parse(expr, mode="eval")
+    except SyntaxError:
+        return None
+    if not _expr_is_fusable(tree):
+        return None
+
+    scalar = _ScalarizeTransformer().visit(tree)
+    ast.fix_missing_locations(scalar)
+    body = ast.unparse(scalar.body)
+
+    src = (
+        "def _k(ch1, ch2, ch3, ch4, out):\n"
+        "    for i in range(out.size):\n"
+        f"        out[i] = {body}\n"
+    )
+    import math
+    ns: Dict[str, Any] = {"math": math}
+    exec(compile(src, "<chan-kernel>", "exec"), ns)
+    try:
+        return numba.njit(fastmath=True, cache=False)(ns["_k"])
+    except Exception:  # pragma: no cover
+        return None
+
+
+# -------------------------------------------------------------------
+# Channel manager
+# -------------------------------------------------------------------
+
+class ChannelManager:
+    """
+    Holds physical, math and relative channels and their enabled state.
+    """
+
+    def __init__(self) -> None:
+        # 4 physical channels by default
+        self.physical_channels: List[ChannelConfig] = [
+            ChannelConfig(
+                name=f"Channel {i+1}",
+                kind="physical",
+                unit="W",
+                index=i,
+                enabled=True,
+            )
+            for i in range(4)
+        ]
+
+        self.math_channels: List[ChannelConfig] = []
+        self.relative_channels: List[ChannelConfig] = []
+
+        # Composed display tuple, rebuilt lazily; mutators invalidate it so
+        # per-frame callers get an O(1) read instead of a rebuild.
+        self._display_cache: Optional[Tuple[ChannelConfig, ...]] = None
+
+    # --- Physical enable/disable ---
+
+    def is_physical_enabled(self, idx: int) -> bool:
+        if 0 <= idx < len(self.physical_channels):
+            return self.physical_channels[idx].enabled
+        return False
+
+    def set_physical_enabled(self, idx: int, enabled: bool) -> None:
+        if 0 <= idx < len(self.physical_channels):
+            self.physical_channels[idx].enabled = enabled
+            self._display_cache = None
+
+    # --- Add math / relative ---
+
+    def add_math_channel(self, cfg: ChannelConfig) -> None:
+        cfg.kind = "math"
+        if cfg.expression:
+            cfg._code = _compile_expr(cfg.expression)
+            cfg._kernel = _build_math_kernel(cfg.expression)
+        self.math_channels.append(cfg)
+        self._display_cache = None
+
+    def add_relative_channel(self, cfg: ChannelConfig) -> None:
+        cfg.kind = "relative"
+        # normalize once so the per-frame eval paths can unpack directly
+        if cfg.rel_src_indices is None:
+            cfg.rel_src_indices = (0, 1)
+        self.relative_channels.append(cfg)
+        self._display_cache = None
+
+    # --- For UI / plotting ---
+
+    def get_display_channels(self) -> Tuple[ChannelConfig, ...]:
+        """
+        Order: enabled physical channels, then math, then relative.
+        The composed tuple is cached until a mutator invalidates it;
+        being a tuple, callers cannot accidentally mutate the cache.
+        """
+        if self._display_cache is None:
+            phys: Iterable[ChannelConfig] = self.physical_channels
+            if not all(c.enabled for c in phys):
+                phys = [c for c in phys if c.enabled]
+            self._display_cache = (
+                *phys, *self.math_channels, *self.relative_channels
+            )
+        return self._display_cache
+
+    # --- Evaluation helpers (scalar) ---
+
+    def eval_math_scalar(
+        self, cfg: ChannelConfig, phys_values_W: Tuple[float, float, float, float]
+    ) -> float:
+        """
+        Evaluate math expression on current scalar physical values in W.
+        phys_values_W: (ch1_W, ch2_W, ch3_W, ch4_W) — indexed, not unpacked,
+        so passing a tuple costs four C-level loads per tick.
+        """
+        context = {
+            "ch1": phys_values_W[0],
+            "ch2": phys_values_W[1],
+            "ch3": phys_values_W[2],
+            "ch4": phys_values_W[3],
+        }
+        return float(safe_eval_expression(cfg.expression or "0", context, code=cfg._code))
+
+    def eval_relative_scalar(
+        self, cfg: ChannelConfig, phys_values_W: Tuple[float, float, float, float]
+    ) -> float:
+        """
+        10*log10(ch_num/ch_den) with some safety.
+        The two sources are picked out of the tuple directly, no per-call
+        unpacking or list build.
+        """
+        num_idx, den_idx = cfg.rel_src_indices
+        num = phys_values_W[num_idx]
+        den = phys_values_W[den_idx]
+        if den <= 0 or num <= 0:
+            # effectively -inf, but clamp for display
+            return float("-inf")
+        return 10.0 * log10(num / den)
+
+    # --- Evaluation helpers (array) ---
+
+    def eval_math_array(self, cfg: ChannelConfig, phys_block_W: np.ndarray) -> np.ndarray:
+        """
+        Evaluate math expression on arrays for sweep plots.
+        phys_block_W: contiguous (4, N) array, one row per physical channel, in W.
+        Rows are passed into the expression as zero-copy views.
+        Evaluation runs in float32: ADC-derived power samples do not need
+        float64, and halving the bytes moved speeds the memory-bound ufuncs.
+        """
+        if not (isinstance(phys_block_W, np.ndarray) and phys_block_W.dtype == np.float32):
+            phys_block_W = np.asarray(phys_block_W, dtype=np.float32)
+
+        # Fused numba kernel: one pass over the inputs, no ufunc temporaries.
+        if cfg._kernel is not None:
+            out = np.empty(phys_block_W.shape[1], dtype=np.float32)
+            try:
+                cfg._kernel(
+                    phys_block_W[0], phys_block_W[1],
+                    phys_block_W[2], phys_block_W[3],
+                    out,
+                )
+                return out
+            except Exception:
+                cfg._kernel = None  # fall back to the eval path for good
+
+        context = {
+            "ch1": phys_block_W[0],
+            "ch2": phys_block_W[1],
+            "ch3": phys_block_W[2],
+            "ch4": phys_block_W[3],
+        }
+
+        # numexpr fuses the remaining ufunc chain block-wise; it supports
+        # the same function whitelist the math dialog advertises.
+        if numexpr is not None and cfg.expression:
+            try:
+                return np.asarray(numexpr.evaluate(cfg.expression, local_dict=context))
+            except Exception:
+                pass  # unsupported construct; use the eval path below
+
+        return np.asarray(safe_eval_expression(cfg.expression or "0", context, code=cfg._code))
+
+    def eval_relative_array(
+        self,
+        cfg: ChannelConfig,
+        phys_block_W: np.ndarray,
+        out: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        Relative transmission in dB on arrays for sweep plots.
+        phys_block_W: contiguous (4, N) array, one row per physical channel, in W.
+        Runs in float32 like eval_math_array. All ops run in-place on a
+        single buffer (reusable via 'out'); non-positive samples map to
+        -inf like the scalar helper.
+        """
+        if not (isinstance(phys_block_W, np.ndarray) and phys_block_W.dtype == np.float32):
+            phys_block_W = np.asarray(phys_block_W, dtype=np.float32)
+        num_idx, den_idx = cfg.rel_src_indices
+        num = phys_block_W[num_idx]
+        den = phys_block_W[den_idx]
+
+        if out is None or out.shape != num.shape or out.dtype != num.dtype:
+            out = np.empty_like(num)
+
+        valid = (num > 0) & (den > 0)
+        np.divide(num, den, out=out, where=valid)
+        # 10*log10(x) == (10/log2(10))*log2(x); log2 is the cheaper ufunc
+        np.log2(out, out=out, where=valid)
+        np.multiply(out, 3.0102999566398116, out=out, where=valid)
+        out[~valid] = -np.inf
+        return out
+
+
+# -------------------------------------------------------------------
+# Math channel dialog
+# -------------------------------------------------------------------
+
+class MathChannelDialog(QtWidgets.QDialog):
+    """
+    Simple dialog for creating/editing a math channel.
+    User enters:
+      - Name (optional)
+      - Expression (required), e.g. "ch1 - ch2" or "10*log10(ch1/ch2)"
+      - Unit (optional)
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Add Math Channel")
+
+        self.channel_name: str = ""
+        self.expression: str = ""
+        self.unit: str = ""
+
+        layout = QtWidgets.QFormLayout(self)
+
+        self.name_edit = QtWidgets.QLineEdit(self)
+        self.expr_edit = QtWidgets.QLineEdit(self)
+        self.unit_edit = QtWidgets.QLineEdit(self)
+
+        self.expr_edit.setPlaceholderText("e.g. ch1 - ch2 or 10*log10(ch1/ch2)")
+
+        layout.addRow("Name:", self.name_edit)
+        layout.addRow("Expression:", self.expr_edit)
+        layout.addRow("Unit:", self.unit_edit)
+
+        help_label = QtWidgets.QLabel(
+            "Variables: ch1, ch2, ch3, ch4 (in W)\n"
+            "Functions: sin, cos, exp, log, log10, sqrt, maximum, minimum, abs"
+        )
+        help_label.setWordWrap(True)
+        layout.addRow(help_label)
+
+        btn_box = QtWidgets.QDialogButtonBox(
+            QtWidgets.QDialogButtonBox.Ok | QtWidgets.QDialogButtonBox.Cancel,
+            QtCore.Qt.Horizontal,
+            self,
+        )
+        btn_box.accepted.connect(self._on_accept)
+        btn_box.rejected.connect(self.reject)
+        layout.addRow(btn_box)
+
+    def _on_accept(self):
+        self.channel_name = self.name_edit.text().strip()
+        self.expression = self.expr_edit.text().strip()
+        self.unit = self.unit_edit.text().strip()
+        if not self.expression:
+            QtWidgets.QMessageBox.warning(
+                self,
+                "Invalid expression",
+                "Expression cannot be empty.",
+            )
+            return
+        self.accept()
+
+
+# -------------------------------------------------------------------
+# Relative transmission dialog
+# -------------------------------------------------------------------
+
+class RelativeTransmissionDialog(QtWidgets.QDialog):
+    """
+    Dialog to define a relative transmission channel of the form:
+        10 * log10(Ch_num / Ch_den)
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Add Relative Transmission Channel")
+
+        self.channel_name: str = ""
+        self.numerator_index: int = 0
+        self.denominator_index: int = 1
+
+        layout = QtWidgets.QFormLayout(self)
+
+        self.name_edit = QtWidgets.QLineEdit(self)
+
+        self.num_combo = QtWidgets.QComboBox(self)
+        self.den_combo = QtWidgets.QComboBox(self)
+
+        # We assume 4 physical channels (1..4)
+        for i in range(4):
+            self.num_combo.addItem(f"Channel {i+1}", i)
+            self.den_combo.addItem(f"Channel {i+1}", i)
+
+        self.num_combo.setCurrentIndex(0)
+        self.den_combo.setCurrentIndex(1)
+
+        layout.addRow("Name:", self.name_edit)
+        layout.addRow("Numerator:", self.num_combo)
+        layout.addRow("Denominator:", self.den_combo)
+
+        info = QtWidgets.QLabel("Result = 10·log10( Numerator / Denominator ) in dB")
+        layout.addRow(info)
+
+        btn_box = QtWidgets.QDialogButtonBox(
+            QtWidgets.QDialogButtonBox.Ok | QtWidgets.QDialogButtonBox.Cancel,
+            QtCore.Qt.Horizontal,
+            self,
+        )
+        btn_box.accepted.connect(self._on_accept)
+        btn_box.rejected.connect(self.reject)
+        layout.addRow(btn_box)
+
+    def _on_accept(self):
+        name = self.name_edit.text().strip()
+        self.channel_name = name
+
+        self.numerator_index = int(self.num_combo.currentData())
+        self.denominator_index = int(self.den_combo.currentData())
+
+        if self.numerator_index == self.denominator_index:
+            QtWidgets.QMessageBox.warning(
+                self,
+                "Invalid selection",
+                "Numerator and denominator must be different channels.",
+            )
+            return
+
+        self.accept()
@@ -3,14 +3,70 @@
 # High-level driver for coreDAQ
 #
 # REQUIREMENTS:
-#   pip install pyserial
+#   pip install pyserial numpy
 
-import serial, time, struct, threading, math, sys, bisect
+import serial, time, struct, threading, bisect, re
 import serial.tools.list_ports
-from array import array
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 from typing import Optional, Tuple, List, Union
 import warnings
 
+# Optional: numba JIT for the bulk LOG conversion kernel
+try:
+    import numba
+except Exception:
+    numba = None
+
+
+if numba is not None:
+    @numba.njit(cache=True, fastmath=True, boundscheck=False)
+    def _log_convert(xs, ys, v_mV, deadband_mV, out):  # pragma: no cover
+        """
+        Fused LOG conversion: deadband + LUT interp + 10**y in one loop.
+        xs/ys: LUT (volts, log10 power); v_mV: samples; out: same length.
+        """
+        n = xs.size
+        for i in range(v_mV.size):
+            mv = v_mV[i]
+            if deadband_mV > 0.0 and abs(mv) < deadband_mV:
+                out[i] = 0.0
+                continue
+            x = mv / 1000.0
+            if x <= xs[0]:
+                y = ys[0]
+            elif x >= xs[n - 1]:
+                y = ys[n - 1]
+            else:
+                j = np.searchsorted(xs, x)
+                x0 = xs[j - 1]
+                x1 = xs[j]
+                y0 = ys[j - 1]
+                y1 = ys[j]
+                y = y0 if x1 == x0 else y0 + (x - x0) / (x1 - x0) * (y1 - y0)
+            out[i] = 10.0 ** y
+
+    @numba.njit(parallel=True, fastmath=True, boundscheck=False, cache=True)
+    def _linear_adc_to_W(adc, zero, lsb_mV, inv_slope, intercept, thr, out):  # pragma: no cover
+        """
+        Fused LINEAR bulk conversion straight from ADC codes: zero
+        subtract + LSB scale + near-zero clamp + (mv-b)*inv_m + floor at
+        0, parallel over frames. adc: (frames, 4) int16; out: (4, frames);
+        zero/inv_slope/intercept: (4,).
+        """
+        n = adc.shape[0]
+        for i in numba.prange(n):
+            for ch in range(4):
+                mv = (adc[i, ch] - zero[ch]) * lsb_mV
+                if thr > 0.0 and abs(mv) < thr:
+                    out[ch, i] = 0.0
+                else:
+                    p = (mv - intercept[ch]) * inv_slope[ch]
+                    out[ch, i] = p if p > 0.0 else 0.0
+else:
+    _log_convert = None
+    _linear_adc_to_W = None
+
 
 class CoreDAQError(Exception):
     pass
@@ -19,6 +75,23 @@ class CoreDAQError(Exception):
 Number = Union[int, float]
 NumOrSeq = Union[Number, List[Number], Tuple[Number, ...]]
 
+# Precompiled reply scanners: a single C-level regex pass replaces the
+# split/replace chains on replies parsed at init or on every snapshot.
+_CAL_RE = re.compile(
+    r"H(?P<h>\d+)\s+G(?P<g>\d+)\s+S=(?P<s>[0-9A-Fa-f]+)\s+I=(?P<i>[0-9A-Fa-f]+)"
+)
+_SNAP_RE = re.compile(
+    r"(-?\d+)\s+(-?\d+)\s+(-?\d+)\s+(-?\d+)(?:.*?G=(\d+)\s+(\d+)\s+(\d+)\s+(\d+))?"
+)
+_GAINS_RE = re.compile(r"HEAD\d+=(\d+)")
+
+# Pre-encoded polled commands: skips the endswith/concat/encode chain in
+# _writeln on queries that run at polling rates.
+_CMD_SNAP_Q = b"SNAP?\n"
+_CMD_STATE_Q = b"STATE?\n"
+_CMD_LEFT_Q = b"LEFT?\n"
+_CMD_STREAM_Q = b"STREAM?\n"
+
 
 class CoreDAQ:
     # --- Device/ADC constants ---
@@ -26,6 +99,7 @@ class CoreDAQ:
     ADC_VFS_VOLTS = 5.0  # ±5 V range (full-scale magnitude)
     # For signed 16-bit bipolar ADC codes, LSB_V = (2*Vfs) / 2^bits
     ADC_LSB_VOLTS = (2.0 * ADC_VFS_VOLTS) / (2 ** ADC_BITS)
+    ADC_LSB_MV = ADC_LSB_VOLTS * 1e3  # folded once; used on snapshot/transfer paths
 
     # Keep legacy names used in your old code
     FS_VOLTS = ADC_VFS_VOLTS
@@ -68,34 +142,81 @@ class CoreDAQ:
             write_timeout=0.5
         )
         self._lock = threading.Lock()
+
+        # Persistent RX line buffer for _readline_fast (short ASCII replies)
+        self._rxbuf = bytearray(256)
+        self._rxlen = 0
+
+        # Best effort: drop the USB-serial latency timer (default ~16 ms on
+        # FTDI/CDC stacks) so short command round-trips are not batched.
+        try:
+            self._ser.set_low_latency_mode(True)
+        except Exception:
+            pass
+
+        # Windows only: enlarge the driver RX buffer so long bulk
+        # transfers don't stall on the default 4 KiB ring.
+        try:
+            self._ser.set_buffer_size(rx_size=1 << 20, tx_size=1 << 15)
+        except Exception:
+            pass
+
         self._drain()
 
         # Detect frontend type ONCE at init
         self._frontend_type: str = self._detect_frontend_type_once()
 
-        # LINEAR calibration tables
-        self._cal_slope = [[0.0 for _ in range(self.NUM_GAINS)] for _ in range(self.NUM_HEADS)]
-        self._cal_intercept = [[0.0 for _ in range(self.NUM_GAINS)] for _ in range(self.NUM_HEADS)]
+        # LINEAR calibration tables: contiguous (heads, gains) float32 SoA
+        self._cal_slope_np = np.zeros((self.NUM_HEADS, self.NUM_GAINS), dtype=np.float32)
+        self._cal_intercept_np = np.zeros((self.NUM_HEADS, self.NUM_GAINS), dtype=np.float32)
+        # reciprocal slope (0 where slope is 0) so conversions multiply
+        self._cal_inv_slope_np = np.zeros((self.NUM_HEADS, self.NUM_GAINS), dtype=np.float32)
+        # display decimals per (head, gain) and the matching power-of-ten
+        # quantum, filled after calibration load
+        self._decimals_np = np.zeros((self.NUM_HEADS, self.NUM_GAINS), dtype=np.int8)
+        self._quant_np = np.ones((self.NUM_HEADS, self.NUM_GAINS), dtype=np.float64)
+        # affine ADC->W coefficients (w = adc*A + B); see _refresh_linear_affine
+        self._cal_A_np = np.zeros((self.NUM_HEADS, self.NUM_GAINS), dtype=np.float64)
+        self._cal_B_np = np.zeros((self.NUM_HEADS, self.NUM_GAINS), dtype=np.float64)
 
         # Near-zero clamp (mV) used by LINEAR conversions (optional)
         self._mv_zero_threshold = 0.0
 
+        # SNAPW (blocking single round-trip snapshot) and batched GAINS
+        # support are probed on first use; None = unknown, False = firmware
+        # too old
+        self._snapw_supported: Optional[bool] = None
+        self._gains_cmd_supported: Optional[bool] = None
+
+        # Host-side gain cache: filled by the first GAINS? and kept in
+        # sync by the setters, so bulk transfers skip the round-trip
+        self._cached_gains: Optional[Tuple[int, int, int, int]] = None
+
         # ====== v3.1: LINEAR zeroing (gain-independent, per-channel) ======
         # Firmware: FACTORY_ZEROS? -> 4 values (CH1..CH4)
         # Host always subtracts active zeros for LINEAR snapshots/transfers.
         # Soft zero overwrites the active zeros (host-side only).
         self._factory_zero_adc: List[int] = [0, 0, 0, 0]
         self._linear_zero_adc: List[int] = [0, 0, 0, 0]
+        # cached ndarray mirror of the active zeros for broadcast subtraction
+        self._linear_zero_np: np.ndarray = np.zeros(4, dtype=np.int32)
 
         # ====== LOG LUT storage ======
         self._loglut_V_V: Optional[List[float]] = None
         self._loglut_log10P: Optional[List[float]] = None
         self._loglut_V_mV: Optional[List[int]] = None
         self._loglut_log10P_Q16: Optional[List[int]] = None
+        # ndarray mirrors for vectorized interpolation over frame buffers
+        self._loglut_xs_np: Optional[np.ndarray] = None
+        self._loglut_ys_np: Optional[np.ndarray] = None
 
         # ====== v3.1: LOG deadband (mV), independent of zeroing ======
         self._log_deadband_mV: float = 300.0  # default; change via set_log_deadband_mV()
 
+        # Reusable (4, N) float32 power buffer for bulk transfers; grown on
+        # demand so repeated captures of the same length allocate nothing.
+        self._xfer_buf_W: Optional[np.ndarray] = None
+
         # Load I2C state and calibration tables
         self.i2c_refresh()
         self._load_calibration_for_frontend()
@@ -123,6 +244,7 @@ class CoreDAQ:
 
     # ---------- Low-level IO helpers ----------
     def _drain(self):
+        self._rxlen = 0
         try:
             self._ser.reset_input_buffer()
         except Exception:
@@ -139,10 +261,37 @@ class CoreDAQ:
             raise CoreDAQError("Device timeout")
         return raw.decode("ascii", "ignore").strip()
 
-    def _ask(self, cmd: str) -> Tuple[str, str]:
-        with self._lock:
-            self._writeln(cmd)
-            line = self._readline()
+    def _readline_fast(self) -> str:
+        """
+        Readline for short command replies without per-call allocations:
+        accumulates into a persistent buffer, slices out one
+        newline-terminated line, and carries any residue over to the
+        next call. Honors the serial timeout like Serial.readline().
+        """
+        ser = self._ser
+        ser_read = ser.read
+        buf = self._rxbuf
+        while True:
+            nl = buf.find(b"\n", 0, self._rxlen)
+            if nl >= 0:
+                line = buf[:nl].decode("ascii", "ignore").strip()
+                rest = self._rxlen - (nl + 1)
+                if rest:
+                    buf[0:rest] = buf[nl + 1:self._rxlen]
+                self._rxlen = rest
+                return line
+
+            r = ser_read(ser.in_waiting or 1)
+            if not r:
+                raise CoreDAQError("Device timeout")
+            end = self._rxlen + len(r)
+            if end > len(buf):
+                buf.extend(bytes(end - len(buf)))
+            buf[self._rxlen:end] = r
+            self._rxlen = end
+
+    @staticmethod
+    def _split_status(line: str) -> Tuple[str, str]:
         if line.startswith("OK"):
             return "OK", line[2:].strip()
         if line.startswith("ERR"):
@@ -151,6 +300,19 @@ class CoreDAQ:
             return "BUSY", ""
         return "ERR", line
 
+    def _ask(self, cmd: str) -> Tuple[str, str]:
+        with self._lock:
+            self._writeln(cmd)
+            line = self._readline_fast()
+        return self._split_status(line)
+
+    def _ask_bytes(self, cmd: bytes) -> Tuple[str, str]:
+        """_ask for pre-encoded, newline-terminated polled commands."""
+        with self._lock:
+            self._ser.write(cmd)
+            line = self._readline_fast()
+        return self._split_status(line)
+
     @staticmethod
     def _parse_int(s: str) -> int:
         return int(s, 0)
@@ -255,9 +417,29 @@ class CoreDAQ:
                 raise CoreDAQError(f"FACTORY_ZEROS? parse error: {payload!r}") from e
 
         self._factory_zero_adc = list(z)
-        self._linear_zero_adc = list(z)
+        self._set_active_zeros(z)
         return list(z)
 
+    def _set_active_zeros(self, z: List[int]) -> None:
+        """Update the active LINEAR zeros and their ndarray mirror together."""
+        self._linear_zero_adc = [int(v) for v in z]
+        self._linear_zero_np = np.asarray(self._linear_zero_adc, dtype=np.int32)
+        self._refresh_linear_affine()
+
+    def _refresh_linear_affine(self) -> None:
+        """
+        Fold zero, LSB scale, intercept and reciprocal slope into the
+        affine form w = adc * A + B per (head, gain), so the broadcast
+        conversion is a single FMA-shaped pass. Depends on both the
+        calibration tables and the active zeros, so it is refreshed when
+        either changes.
+        """
+        inv = self._cal_inv_slope_np.astype(np.float64)
+        zero = self._linear_zero_np.astype(np.float64)[:, None]
+        lsb_mV = self.ADC_LSB_MV
+        self._cal_A_np = lsb_mV * inv
+        self._cal_B_np = (-zero * lsb_mV - self._cal_intercept_np) * inv
+
     def refresh_factory_zeros(self) -> Tuple[int, int, int, int]:
         """
         LINEAR-only. Re-queries FACTORY_ZEROS? and sets them as active zeros.
@@ -291,7 +473,7 @@ class CoreDAQ:
         """
         if self._frontend_type != self.FRONTEND_LINEAR:
             return
-        self._linear_zero_adc = [int(z1), int(z2), int(z3), int(z4)]
+        self._set_active_zeros([z1, z2, z3, z4])
 
     def restore_factory_zero(self) -> None:
         """
@@ -308,7 +490,7 @@ class CoreDAQ:
             except Exception:
                 pass
 
-        self._linear_zero_adc = list(self._factory_zero_adc)
+        self._set_active_zeros(self._factory_zero_adc)
 
     def soft_zero_from_snapshot(self, n_frames: int = 32, settle_s: float = 0.2) -> Tuple[List[int], List[int]]:
         """
@@ -323,17 +505,18 @@ class CoreDAQ:
 
         time.sleep(max(0.0, float(settle_s)))
         codes, gains = self.snapshot_adc(n_frames=n_frames)
-        self._linear_zero_adc = [int(codes[0]), int(codes[1]), int(codes[2]), int(codes[3])]
+        self._set_active_zeros(codes[:4])
         return codes, gains
 
-    def _apply_linear_zero_ch(self, codes: List[int]) -> List[int]:
+    def _apply_linear_zero_ch(self, codes) -> np.ndarray:
         """
-        LINEAR-only: subtract per-channel active zeros.
-        LOG: passthrough.
+        LINEAR-only: subtract per-channel active zeros (one broadcast op).
+        LOG: passthrough (still returned as an int32 array).
         """
+        codes = np.asarray(codes[:4], dtype=np.int32)
         if self._frontend_type != self.FRONTEND_LINEAR:
             return codes
-        return [int(codes[i]) - int(self._linear_zero_adc[i]) for i in range(4)]
+        return codes - self._linear_zero_np
 
     # ---------- v3.1: LOG deadband controls ----------
     def set_log_deadband_mV(self, deadband_mV: float) -> None:
@@ -358,46 +541,118 @@ class CoreDAQ:
         else:
             raise CoreDAQError(f"Unknown frontend type: {self._frontend_type}")
 
+    def _try_load_linear_calibration_bulk(self) -> bool:
+        """
+        Bulk calibration load via a single round-trip.
+
+        Firmware command:
+          CAL_ALL?
+        Stream:
+          OK N=<n_floats>
+          <binary payload: heads x gains x (slope, intercept) float32 LE>
+
+        Returns False (leaving the tables untouched) on firmware that does
+        not implement CAL_ALL?, so the caller can fall back to the 32
+        per-element CAL queries.
+        """
+        expected = self.NUM_HEADS * self.NUM_GAINS * 2
+
+        try:
+            with self._lock:
+                self._rxlen = 0
+                self._ser.reset_input_buffer()
+                self._writeln("CAL_ALL?")
+                line = self._readline()
+
+                if not line.startswith("OK") or "N=" not in line:
+                    return False
+
+                try:
+                    n_floats = int(line.split("N=", 1)[1].split()[0])
+                except ValueError:
+                    return False
+                if n_floats != expected:
+                    return False
+
+                payload_len = n_floats * 4
+                payload = self._ser.read(payload_len)
+                if len(payload) != payload_len:
+                    raise CoreDAQError(
+                        f"Short CAL_ALL? payload: got {len(payload)} / {payload_len}"
+                    )
+        except CoreDAQError:
+            return False
+
+        arr = np.frombuffer(payload, dtype=np.dtype("<f4")).reshape(
+            self.NUM_HEADS, self.NUM_GAINS, 2
+        )
+        self._cal_slope_np = np.ascontiguousarray(arr[..., 0])
+        self._cal_intercept_np = np.ascontiguousarray(arr[..., 1])
+        self._finalize_linear_calibration()
+        return True
+
+    def _finalize_linear_calibration(self) -> None:
+        """Derive tables that depend on the loaded slopes.
+
+        Computes the reciprocal-slope table (0 where the slope is 0) and
+        the per-(head, gain) display-decimals table, so the conversion
+        hot paths multiply and look up instead of dividing and calling
+        math.log10 per channel.
+        """
+        slope = self._cal_slope_np
+        self._cal_inv_slope_np = np.where(
+            slope != 0.0, 1.0 / np.where(slope != 0.0, slope, 1.0), 0.0
+        ).astype(np.float32)
+
+        # power per ADC LSB (W) at each (head, gain); decimals such that
+        # rounding keeps roughly one LSB of resolution
+        lsb_mV = self.ADC_LSB_MV
+        power_lsb = lsb_mV * self._cal_inv_slope_np.astype(np.float64)
+        self._decimals_np = np.clip(
+            np.round(-np.log10(np.where(power_lsb > 0, power_lsb, 1.0))),
+            0, 12,
+        ).astype(np.int8)
+        # matching rounding quantum (10**decimals), gathered per snapshot
+        self._quant_np = np.power(10.0, self._decimals_np.astype(np.float64))
+
+        self._refresh_linear_affine()
+
     def _load_linear_calibration(self):
         """
-        Query all heads/gains via CAL <head> <gain> and populate:
-          self._cal_slope[head-1][gain]     (mV/W)
-          self._cal_intercept[head-1][gain] (mV)
+        Query all heads/gains and populate:
+          self._cal_slope_np[head-1, gain]     (mV/W)
+          self._cal_intercept_np[head-1, gain] (mV)
 
-        Expects:
+        Prefers the single CAL_ALL? bulk query (one serial round-trip);
+        falls back to 32 individual CAL <head> <gain> round-trips, which
+        expect:
           OK H<h> G<g> S=<SLOPE_HEX> I=<INTERCEPT_HEX>
         """
+        if self._try_load_linear_calibration_bulk():
+            return
+
         for head in range(1, self.NUM_HEADS + 1):
             for gain in range(self.NUM_GAINS):
                 status, payload = self._ask(f"CAL {head} {gain}")
                 if status != "OK":
                     raise CoreDAQError(f"CAL {head} {gain} failed: {payload}")
 
-                parts = payload.split()
-                if len(parts) < 4:
+                m = _CAL_RE.search(payload)
+                if m is None:
                     raise CoreDAQError(f"Unexpected CAL reply: {payload!r}")
 
-                slope_hex = None
-                intercept_hex = None
-                for token in parts:
-                    if token.startswith("S="):
-                        slope_hex = token.split("=", 1)[1]
-                    elif token.startswith("I="):
-                        intercept_hex = token.split("=", 1)[1]
-
-                if slope_hex is None or intercept_hex is None:
-                    raise CoreDAQError(f"Missing S= or I= in CAL reply: {payload!r}")
-
                 try:
-                    slope_bits = int(slope_hex, 16)
-                    intercept_bits = int(intercept_hex, 16)
+                    slope_bits = int(m["s"], 16)
+                    intercept_bits = int(m["i"], 16)
                     slope = struct.unpack("<f", slope_bits.to_bytes(4, "little"))[0]
                     intercept = struct.unpack("<f", intercept_bits.to_bytes(4, "little"))[0]
                 except Exception as e:
                     raise CoreDAQError(f"Failed parsing CAL payload {payload!r}: {e}")
 
-                self._cal_slope[head - 1][gain] = float(slope)
-                self._cal_intercept[head - 1][gain] = float(intercept)
+                self._cal_slope_np[head - 1, gain] = slope
+                self._cal_intercept_np[head - 1, gain] = intercept
+
+        self._finalize_linear_calibration()
 
     def _load_log_calibration(self):
         """
@@ -414,6 +669,7 @@ class CoreDAQ:
           int32  log10P_Q16
         """
         with self._lock:
+            self._rxlen = 0
             self._ser.reset_input_buffer()
             self._writeln("LOGCAL 1")
 
@@ -457,30 +713,47 @@ class CoreDAQ:
             if not done_ok:
                 raise CoreDAQError("LOGCAL missing OK DONE terminator")
 
-        V_mV: List[int] = []
-        Q16: List[int] = []
-        for i in range(n_pts):
-            v, q = struct.unpack_from("<Hi", payload, i * rb)
-            V_mV.append(int(v))
-            Q16.append(int(q))
+        rec_dt = np.dtype([("v_mV", "<u2"), ("log10P_Q16", "<i4")])
+        assert rec_dt.itemsize == rb
 
-        if not V_mV:
+        rec = np.frombuffer(payload, dtype=rec_dt, count=n_pts)
+        if rec.size == 0:
             raise CoreDAQError("LOG LUT empty")
 
-        self._loglut_V_mV = V_mV
-        self._loglut_log10P_Q16 = Q16
-        self._loglut_V_V = [v / 1000.0 for v in V_mV]
-        self._loglut_log10P = [q / 65536.0 for q in Q16]
+        v_mV = rec["v_mV"].astype(np.int64)
+        q16 = rec["log10P_Q16"].astype(np.int64)
 
-        if len(self._loglut_V_V) != len(self._loglut_log10P):
-            raise CoreDAQError("LOG LUT length mismatch after decode")
+        self._loglut_xs_np = v_mV / 1000.0
+        self._loglut_ys_np = q16 / 65536.0
+
+        # Python-list mirrors kept for the scalar conversion path
+        self._loglut_V_mV = v_mV.tolist()
+        self._loglut_log10P_Q16 = q16.tolist()
+        self._loglut_V_V = self._loglut_xs_np.tolist()
+        self._loglut_log10P = self._loglut_ys_np.tolist()
 
     # ---------- LOG conversion (volts -> power) ----------
+    def voltage_to_power_W_array(self, v_volts) -> np.ndarray:
+        """
+        Vectorized LUT conversion: volts (array-like) -> power (W) ndarray.
+        np.interp clamps at the LUT edges like the scalar path.
+        """
+        self._require_frontend(self.FRONTEND_LOG, "voltage_to_power_W_array")
+        if self._loglut_xs_np is None or self._loglut_ys_np is None:
+            raise CoreDAQError("LOG LUT not loaded")
+
+        y = np.interp(np.asarray(v_volts, dtype=np.float64),
+                      self._loglut_xs_np, self._loglut_ys_np)
+        return np.power(10.0, y, out=y)
+
     def voltage_to_power_W(self, v_volts: NumOrSeq):
         self._require_frontend(self.FRONTEND_LOG, "voltage_to_power_W")
         if self._loglut_V_V is None or self._loglut_log10P is None:
             raise CoreDAQError("LOG LUT not loaded")
 
+        if isinstance(v_volts, (list, tuple, np.ndarray)):
+            return self.voltage_to_power_W_array(v_volts).tolist()
+
         xs = self._loglut_V_V
         ys = self._loglut_log10P
 
@@ -500,17 +773,63 @@ class CoreDAQ:
                 y = y0 + t * (y1 - y0)
             return 10.0 ** y
 
-        if isinstance(v_volts, (list, tuple)):
-            return [interp_one(float(v)) for v in v_volts]
         return float(interp_one(float(v_volts)))
 
     # ---------- Snapshot (raw ADC + gains) ----------
+    @staticmethod
+    def _parse_snapshot_payload(payload: str):
+        """
+        Parse '<c1> <c2> <c3> <c4> ... G=<g1> <g2> <g3> <g4>' into
+        (codes_list[4], gains_list[4]).
+        """
+        m = _SNAP_RE.match(payload.lstrip())
+        if m is None:
+            raise CoreDAQError(f"Failed to parse snapshot payload: {payload}")
+
+        g = m.groups()
+        codes = [int(x) for x in g[:4]]
+        # G= block is optional (absent on LOG heads)
+        gains = [int(x) for x in g[4:]] if g[4] is not None else [0, 0, 0, 0]
+        return codes, gains
+
+    def _snapshot_adc_blocking(self, n_frames: int, timeout_s: float):
+        """
+        Single round-trip snapshot via SNAPW (newer firmware).
+
+        SNAPW blocks on the device until the frames are averaged, then
+        emits one 'OK <codes> G=<gains>' line — no BUSY polling. Returns
+        None if the firmware rejects the command, and remembers that so
+        subsequent snapshots go straight to the SNAP/SNAP? poll path.
+        """
+        old_timeout = self._ser.timeout
+        try:
+            self._ser.timeout = timeout_s + 0.1
+            st, payload = self._ask(f"SNAPW {n_frames}")
+        except CoreDAQError:
+            self._snapw_supported = False
+            return None
+        finally:
+            self._ser.timeout = old_timeout
+
+        if st != "OK":
+            self._snapw_supported = False
+            return None
+
+        self._snapw_supported = True
+        return self._parse_snapshot_payload(payload)
+
     def snapshot_adc(self, n_frames: int = 1, timeout_s: float = 1.0, poll_hz: float = 200.0):
         """
         MCU returns ADC codes (signed 16-bit) for 4 channels + gains.
         Returns:
           (codes_list[4], gains_list[4])
         """
+        # Newer firmware: one blocking round-trip instead of a poll loop
+        if self._snapw_supported is not False:
+            res = self._snapshot_adc_blocking(n_frames, timeout_s)
+            if res is not None:
+                return res
+
         st, payload = self._ask(f"SNAP {n_frames}")
         if st != "OK":
             raise CoreDAQError(f"SNAP arm failed: {payload}")
@@ -519,7 +838,7 @@ class CoreDAQ:
         sleep_s = 1.0 / poll_hz
 
         while True:
-            st, payload = self._ask("SNAP?")
+            st, payload = self._ask_bytes(_CMD_SNAP_Q)
             if st == "BUSY":
                 if (time.time() - t0) > timeout_s:
                     raise CoreDAQError("Snapshot timeout")
@@ -529,28 +848,7 @@ class CoreDAQ:
             if st != "OK":
                 raise CoreDAQError(f"SNAP? failed: {payload}")
 
-            parts = payload.split()
-            if len(parts) < 4:
-                raise CoreDAQError(f"SNAP? payload too short: {payload}")
-
-            try:
-                codes = [int(parts[i]) for i in range(4)]
-            except ValueError as e:
-                raise CoreDAQError(f"Failed to parse ADC codes from SNAP?: {payload}") from e
-
-            gains = [0, 0, 0, 0]
-            for i, part in enumerate(parts):
-                if "G=" in part:
-                    try:
-                        gains[0] = int(part.split("=")[1])
-                        gains[1] = int(parts[i + 1])
-                        gains[2] = int(parts[i + 2])
-                        gains[3] = int(parts[i + 3])
-                    except (ValueError, IndexError) as e:
-                        raise CoreDAQError(f"Failed to parse gains from SNAP?: {payload}") from e
-                    break
-
-            return codes, gains
+            return self._parse_snapshot_payload(payload)
 
     # ---------- v3.1: snapshot_volts/mV with LINEAR zero subtraction ----------
     def snapshot_volts(
@@ -562,7 +860,7 @@ class CoreDAQ:
     ):
         codes, gains = self.snapshot_adc(n_frames=n_frames, timeout_s=timeout_s, poll_hz=poll_hz)
         codes = self._apply_linear_zero_ch(codes)
-        v = [float(c) * self.ADC_LSB_VOLTS for c in codes]
+        v = (codes * self.ADC_LSB_VOLTS).tolist()
         return v, gains
 
     def snapshot_mV(
@@ -574,9 +872,8 @@ class CoreDAQ:
     ):
         codes, gains = self.snapshot_adc(n_frames=n_frames, timeout_s=timeout_s, poll_hz=poll_hz)
         codes = self._apply_linear_zero_ch(codes)
-        lsb_mV = self.ADC_LSB_VOLTS * 1e3
-        mv = [float(c) * lsb_mV for c in codes]
-        mv = [round(x, 3) for x in mv]
+        lsb_mV = self.ADC_LSB_MV
+        mv = np.round(codes * lsb_mV, 3).tolist()
         return mv, gains
 
     # ---------- Snapshot_W (unified, includes LINEAR autogain + LOG deadband) ----------
@@ -627,61 +924,57 @@ class CoreDAQ:
 
         # ---------- LINEAR frontend ----------
         if self._frontend_type == self.FRONTEND_LINEAR:
+            mv = gains = None
             if autogain:
                 for _ in range(max_iters):
-                    mv_now, gains = self.snapshot_mV(
+                    mv, gains = self.snapshot_mV(
                         n_frames=n_frames,
                         timeout_s=timeout_s,
                         poll_hz=poll_hz,
                         use_zero=None
                     )
-                    changed = False
-
-                    for ch in range(4):
-                        vabs = abs(float(mv_now[ch]))
-                        g = int(gains[ch])
-                        head = ch + 1
 
-                        if vabs < min_mv and g < 7:
-                            self.set_gain(head, g + 1)
-                            changed = True
-                        elif vabs > max_mv and g > 0:
-                            self.set_gain(head, g - 1)
-                            changed = True
+                    # all four range decisions in one mask pass
+                    mv_abs = np.abs(np.asarray(mv[:4], dtype=np.float64))
+                    g_now = np.asarray(gains[:4], dtype=np.int64)
+                    up = (mv_abs < min_mv) & (g_now < 7)
+                    dn = (mv_abs > max_mv) & (g_now > 0)
+                    g_new = g_now + up.astype(np.int64) - dn.astype(np.int64)
 
-                    if not changed:
+                    if not bool((g_new != g_now).any()):
+                        # converged: the snapshot just taken is already at
+                        # the final gains, no extra acquisition needed
                         break
-                    time.sleep(settle_s)
-
-            # final snapshot for conversion
-            mv, gains = self.snapshot_mV(n_frames=n_frames, timeout_s=timeout_s, poll_hz=poll_hz, use_zero=None)
-
-            adc_mv_per_lsb = self.ADC_LSB_VOLTS * 1e3
-            out: List[float] = []
-
-            for ch in range(4):
-                head_idx = ch
-                gain = int(gains[ch])
 
-                slope_mV_per_W = float(self._cal_slope[head_idx][gain])
-                intercept_mV = float(self._cal_intercept[head_idx][gain])
+                    if self._gains_cmd_supported is not False:
+                        self.set_gains(g_new.tolist())
+                    else:
+                        for ch in np.flatnonzero(g_new != g_now):
+                            self.set_gain(int(ch) + 1, int(g_new[ch]))
+                    # gains changed after this read, so it is stale
+                    mv = gains = None
+                    time.sleep(settle_s)
 
-                if slope_mV_per_W == 0.0:
-                    raise CoreDAQError(f"Invalid slope for head {head_idx+1}, gain {gain}")
+            if mv is None:
+                mv, gains = self.snapshot_mV(n_frames=n_frames, timeout_s=timeout_s, poll_hz=poll_hz, use_zero=None)
 
-                mv_corr = float(mv[ch])
+            # gather per-channel constants, then one fused vector conversion
+            g = np.asarray(gains[:4], dtype=np.intp)
+            inv_slope = self._cal_inv_slope_np[np.arange(4), g].astype(np.float64)
+            intercept = self._cal_intercept_np[np.arange(4), g].astype(np.float64)
 
-                if abs(mv_corr) < float(self._mv_zero_threshold):
-                    out.append(0.0)
-                    continue
+            if np.any(inv_slope == 0.0):
+                bad = int(np.flatnonzero(inv_slope == 0.0)[0])
+                raise CoreDAQError(f"Invalid slope for head {bad+1}, gain {int(g[bad])}")
 
-                power_lsb = adc_mv_per_lsb / slope_mV_per_W
-                decimals = 0 if power_lsb <= 0 else max(0, min(12, round(-math.log10(power_lsb))))
+            mv_arr = np.asarray(mv, dtype=np.float64)
+            p_w = np.maximum((mv_arr - intercept) * inv_slope, 0.0)
+            p_w[np.abs(mv_arr) < float(self._mv_zero_threshold)] = 0.0
 
-                p_w = (mv_corr - intercept_mV) / slope_mV_per_W
-                if p_w < 0.0:
-                    p_w = 0.0
-                out.append(round(p_w, decimals))
+            # per-channel decimals vary, so round via the precomputed
+            # power-of-ten quantum in one vector pass
+            scale = self._quant_np[np.arange(4), g]
+            out = (np.round(p_w * scale) / scale).tolist()
 
             if return_debug:
                 return out, mv, gains
@@ -700,24 +993,66 @@ class CoreDAQ:
         st, payload = self._ask(f"GAIN {head} {value}")
         if st != "OK":
             raise CoreDAQError(f"GAIN {head} failed: {payload}")
-        
+
+        if self._cached_gains is not None:
+            g = list(self._cached_gains)
+            g[head - 1] = value
+            self._cached_gains = tuple(g)
+
         time.sleep(0.05) # settle
 
+    def set_gains(self, values: List[int]) -> None:
+        """
+        Set all four gains at once.
+
+        Newer firmware accepts 'GAINS g1 g2 g3 g4' (one round-trip, one
+        settle); support is probed on first use and older firmware falls
+        back to four individual GAIN commands.
+        """
+        self._require_frontend(self.FRONTEND_LINEAR, "set_gains")
+        vals = [int(v) for v in values]
+        if len(vals) != 4:
+            raise ValueError("need exactly 4 gain values")
+        for v in vals:
+            if not (0 <= v <= 7):
+                raise ValueError("gain value must be 0..7")
+
+        if self._gains_cmd_supported is not False:
+            st, _payload = self._ask(f"GAINS {vals[0]} {vals[1]} {vals[2]} {vals[3]}")
+            if st == "OK":
+                self._gains_cmd_supported = True
+                self._cached_gains = tuple(vals)
+                time.sleep(0.05)  # settle
+                return
+            self._gains_cmd_supported = False
+
+        for head in range(1, 5):
+            self.set_gain(head, vals[head - 1])
+
     def get_gains(self) -> Tuple[int, int, int, int]:
+        """
+        Current gain indices. Served from a host-side cache kept in sync
+        by the gain setters; gains only change through this API, so the
+        GAINS? round-trip happens once (or after refresh_gains()).
+        """
         self._require_frontend(self.FRONTEND_LINEAR, "get_gains")
+        if self._cached_gains is not None:
+            return self._cached_gains
+        return self.refresh_gains()
+
+    def refresh_gains(self) -> Tuple[int, int, int, int]:
+        """Re-query GAINS? from the device and refresh the cache."""
+        self._require_frontend(self.FRONTEND_LINEAR, "refresh_gains")
 
         st, payload = self._ask("GAINS?")
         if st != "OK":
             raise CoreDAQError(f"GAINS? failed: {payload}")
 
-        parts = payload.replace("HEAD", "").replace("=", " ").split()
-        try:
-            nums = [int(parts[i]) for i in range(1, len(parts), 2)]
-            if len(nums) != 4:
-                raise ValueError
-            return tuple(nums)  # type: ignore[return-value]
-        except Exception:
+        nums = _GAINS_RE.findall(payload)
+        if len(nums) != 4:
             raise CoreDAQError(f"Unexpected GAINS? payload: '{payload}'")
+        self._cached_gains = tuple(int(n) for n in nums)
+        return self._cached_gains  # type: ignore[return-value]
 
     def set_gain1(self, value: int): self.set_gain(1, value)
     def set_gain2(self, value: int): self.set_gain(2, value)
@@ -726,7 +1061,7 @@ class CoreDAQ:
 
     # ---------- State / acquisition helpers ----------
     def state_enum(self) -> int:
-        st, p = self._ask("STATE?")
+        st, p = self._ask_bytes(_CMD_STATE_Q)
         if st != "OK":
             raise CoreDAQError(p)
         return self._parse_int(p)
@@ -759,13 +1094,13 @@ class CoreDAQ:
             raise CoreDAQError(f"ACQ STOP failed: {p}")
 
     def acquisition_status(self) -> str:
-        st, p = self._ask("STREAM?")
+        st, p = self._ask_bytes(_CMD_STREAM_Q)
         if st != "OK":
             raise CoreDAQError(p)
         return p
 
     def frames_remaining(self) -> int:
-        st, p = self._ask("LEFT?")
+        st, p = self._ask_bytes(_CMD_LEFT_Q)
         if st != "OK":
             raise CoreDAQError(p)
         return self._parse_int(p)
@@ -781,24 +1116,60 @@ class CoreDAQ:
                 raise CoreDAQError("Acquisition timeout")
             time.sleep(poll_s)
 
+    def notify_when_done(
+        self,
+        callback,
+        poll_s: float = 0.05,
+        delay_s: float = 0.0,
+        timeout_s: Optional[float] = None,
+    ) -> threading.Thread:
+        """
+        Invoke 'callback' from a daemon thread once the acquisition
+        completes, instead of blocking the caller in a sleep.
+
+        Typical CLI use:
+          done = threading.Event()
+          daq.notify_when_done(done.set, delay_s=frames/rate)
+          done.wait(timeout=...)
+
+        GUI code can have the callback post an event/signal back to the
+        event loop. 'delay_s' defers the first STATE? poll (e.g. by the
+        nominal capture time) so the wait does not hammer the serial link.
+        Timeout or device errors are swallowed; the callback simply never
+        fires, so always pair with a timed wait.
+        """
+        def _watch():
+            try:
+                if delay_s > 0.0:
+                    time.sleep(delay_s)
+                self.wait_for_completion(poll_s=poll_s, timeout_s=timeout_s)
+            except Exception:
+                return
+            callback()
+
+        t = threading.Thread(target=_watch, daemon=True)
+        t.start()
+        return t
+
     # ---------- Bulk transfer (ADC codes) ----------
-    def transfer_frames_adc(self, frames: int) -> List[List[int]]:
+    def _transfer_frames_adc_arr(self, frames: int) -> np.ndarray:
         """
         Transfers <frames> frames of raw ADC codes.
         Host -> Dev:  XFER <bytes>
         Dev  -> Host: OK ...
                       <binary payload>
 
-        Returns: [ch1_codes, ch2_codes, ch3_codes, ch4_codes] each length=frames
+        Returns the received payload as a (frames, 4) int16 ndarray
+        (zero-copy view of the transfer buffer).
         """
         if frames <= 0:
             raise ValueError("frames must be > 0")
 
         ser = self._ser
         bytes_needed = frames * 4 * 2  # 4 channels, int16 each
-        time.sleep(0.05)
 
         with self._lock:
+            self._rxlen = 0
             ser.reset_input_buffer()
             self._writeln(f"XFER {bytes_needed}")
             ser.flush()
@@ -807,31 +1178,50 @@ class CoreDAQ:
             if not line.startswith("OK"):
                 raise CoreDAQError(f"XFER refused: {line}")
 
+            # One large read first (a single syscall in the common case);
+            # top up with 1 MiB chunks only if it comes back short. Widen
+            # the timeout to cover the full payload at line rate so the
+            # big read isn't cut short on slow links.
             buf = bytearray(bytes_needed)
             mv = memoryview(buf)
-            got = 0
-            chunk = 262144
-            while got < bytes_needed:
-                r = ser.read(min(chunk, bytes_needed - got))
-                if not r:
-                    raise TimeoutError(f"USB read timeout at {got}/{bytes_needed} bytes")
-                mv[got:got + len(r)] = r
-                got += len(r)
-
-        samples = array('h')
-        samples.frombytes(buf)
-        if sys.byteorder != "little":
-            samples.byteswap()
-
-        ch1 = list(samples[0::4])
-        ch2 = list(samples[1::4])
-        ch3 = list(samples[2::4])
-        ch4 = list(samples[3::4])
-
-        if len(ch1) != frames:
-            raise CoreDAQError(f"Parse mismatch: expected {frames} frames, got {len(ch1)}")
-
-        return [ch1, ch2, ch3, ch4]
+            old_timeout = ser.timeout
+            ser_read = ser.read  # bound once; the top-up loop is hot
+            try:
+                ser.timeout = bytes_needed * 10.0 / 115200.0 + 0.1
+                r = ser_read(bytes_needed)
+                mv[0:len(r)] = r
+                got = len(r)
+
+                chunk = 1 << 20
+                while got < bytes_needed:
+                    r = ser_read(min(chunk, bytes_needed - got))
+                    if not r:
+                        raise TimeoutError(f"USB read timeout at {got}/{bytes_needed} bytes")
+                    mv[got:got + len(r)] = r
+                    got += len(r)
+            finally:
+                ser.timeout = old_timeout
+
+        # Explicit little-endian dtype: no byteswap branch, and the reshape
+        # gives zero-copy per-channel column views instead of 4N boxed ints.
+        arr = np.frombuffer(buf, dtype=np.dtype("<i2")).reshape(-1, 4)
+
+        if arr.shape[0] != frames:
+            raise CoreDAQError(f"Parse mismatch: expected {frames} frames, got {arr.shape[0]}")
+
+        return arr
+
+    def transfer_frames_adc(self, frames: int) -> List[np.ndarray]:
+        """
+        Transfers <frames> frames of raw ADC codes.
+
+        Returns: [ch1_codes, ch2_codes, ch3_codes, ch4_codes], each a
+        contiguous int16 ndarray of length=frames (the interleaved
+        payload is deinterleaved once so downstream vector ops run over
+        unit-stride memory).
+        """
+        arr = self._transfer_frames_adc_arr(frames)
+        return [np.ascontiguousarray(arr[:, i]) for i in range(4)]
 
     def transfer_frames_raw(self, frames: int) -> List[List[int]]:
         return self.transfer_frames_adc(frames)
@@ -842,43 +1232,83 @@ class CoreDAQ:
         frames: int,
         use_zero: Optional[bool] = None,          # kept for compatibility; ignored
         log_deadband_mV: Optional[float] = None
-    ) -> List[List[float]]:
+    ) -> List[np.ndarray]:
+        """
+        Transfers frames and converts to mV per channel. Returns
+        [ch1, ch2, ch3, ch4], each a float32 ndarray of length=frames.
+        """
         ch = self.transfer_frames_adc(frames)
-        lsb_mV = self.ADC_LSB_VOLTS * 1e3
+        lsb_mV = self.ADC_LSB_MV
 
         # LINEAR: always subtract per-channel zero offsets (gain-independent)
         if self._frontend_type == self.FRONTEND_LINEAR:
-            out: List[List[float]] = [[], [], [], []]
-            for head_idx in range(4):
-                z = int(self._linear_zero_adc[head_idx])
-                out[head_idx] = [float(code - z) * lsb_mV for code in ch[head_idx]]
-            return out
+            z = self._linear_zero_np
+            lsb = np.float32(lsb_mV)
+            return [
+                (ch[h].astype(np.float32) - np.float32(z[h])) * lsb
+                for h in range(4)
+            ]
 
         # LOG: apply deadband in mV (does not use zeroing at all)
         if self._frontend_type == self.FRONTEND_LOG:
             db = self._log_deadband_mV if log_deadband_mV is None else float(log_deadband_mV)
+            lsb = np.float32(lsb_mV)
             out = []
-            for lst in ch:
-                mv_list = [float(x) * lsb_mV for x in lst]
+            for arr in ch:
+                mv = arr.astype(np.float32) * lsb
                 if db > 0.0:
-                    mv_list = [0.0 if abs(v) < db else v for v in mv_list]
-                out.append(mv_list)
+                    # branchless: mask-multiply instead of indexed assignment
+                    mv *= (np.abs(mv) >= np.float32(db))
+                out.append(mv)
             return out
 
         raise CoreDAQError(f"Unknown frontend type: {self._frontend_type}")
 
-    def transfer_frames_volts(self, frames: int, use_zero: Optional[bool] = None) -> List[List[float]]:
+    def transfer_frames_volts(
+        self,
+        frames: int,
+        use_zero: Optional[bool] = None,
+        inplace: bool = True,
+    ) -> List[np.ndarray]:
+        """
+        Like transfer_frames_mV but scaled to volts. The mV arrays are
+        owned by this call, so by default they are rescaled in place and
+        returned without allocating a second set of buffers; pass
+        inplace=False to get fresh arrays.
+        """
         mv = self.transfer_frames_mV(frames, use_zero=use_zero)
-        return [[x / 1000.0 for x in lst] for lst in mv]
+        if inplace:
+            for arr in mv:
+                arr *= np.float32(1e-3)
+            return mv
+        return [arr * np.float32(1e-3) for arr in mv]
+
+    def _power_buffer(self, frames: int) -> np.ndarray:
+        """
+        Return a (4, frames) float32 view of the reusable transfer buffer,
+        growing it when needed. The view is invalidated by the next transfer.
+        """
+        buf = self._xfer_buf_W
+        if buf is None or buf.shape[1] < frames:
+            buf = np.empty((4, frames), dtype=np.float32)
+            self._xfer_buf_W = buf
+        return buf[:, :frames]
 
     def transfer_frames_W(
         self,
         frames: int,
         use_zero: Optional[bool] = None,          # kept for compatibility; ignored
-        log_deadband_mV: Optional[float] = None
-    ) -> List[List[float]]:
+        log_deadband_mV: Optional[float] = None,
+        round_output: bool = True,
+    ) -> np.ndarray:
         """
         Transfers frames and converts to optical power in watts per channel.
+        Pass round_output=False to skip the per-gain display rounding and
+        get raw converted power (LINEAR only; LOG output is not rounded).
+
+        Returns a (4, frames) float32 array backed by a reusable internal
+        buffer: rows are ch1..ch4, and the view is overwritten by the next
+        transfer, so copy it if you need to keep it across captures.
 
         LINEAR:
           - reads GAINS? once (assumes fixed during acquisition)
@@ -893,53 +1323,75 @@ class CoreDAQ:
             raise ValueError("frames must be > 0")
 
         if self._frontend_type == self.FRONTEND_LINEAR:
-            mv_ch = self.transfer_frames_mV(frames, use_zero=None)
+            adc = self._transfer_frames_adc_arr(frames)  # (frames, 4) int16
             gains = self.get_gains()
 
-            adc_mv_per_lsb = self.ADC_LSB_VOLTS * 1e3
-            power_ch: List[List[float]] = [[], [], [], []]
+            # gains are fixed across a transfer, so the per-channel constants
+            # broadcast down each row in one fused pass
+            g = np.asarray(gains[:4], dtype=np.intp)
+            inv_slope = self._cal_inv_slope_np[np.arange(4), g].astype(np.float64)
+            intercept = self._cal_intercept_np[np.arange(4), g].astype(np.float64)
 
-            for ch_idx in range(4):
-                gain = int(gains[ch_idx])
+            if np.any(inv_slope == 0.0):
+                bad = int(np.flatnonzero(inv_slope == 0.0)[0])
+                raise CoreDAQError(f"Invalid slope for head {bad+1}, gain {int(g[bad])}")
 
-                slope_mV_per_W = float(self._cal_slope[ch_idx][gain])
-                intercept_mV = float(self._cal_intercept[ch_idx][gain])
+            zero = self._linear_zero_np
+            lsb_mV = self.ADC_LSB_MV
+            thr = float(self._mv_zero_threshold)
+            out = self._power_buffer(frames)
 
-                if slope_mV_per_W == 0.0:
-                    raise CoreDAQError(f"Invalid slope for head {ch_idx+1}, gain {gain}")
-
-                power_lsb = adc_mv_per_lsb / slope_mV_per_W
-                decimals = 0 if power_lsb <= 0 else max(0, min(12, round(-math.log10(power_lsb))))
-
-                out_list = power_ch[ch_idx]
-                for mv_val in mv_ch[ch_idx]:
-                    mv_corr = float(mv_val)
-
-                    if abs(mv_corr) < float(self._mv_zero_threshold):
-                        out_list.append(0.0)
-                        continue
-
-                    p_w = (mv_corr - intercept_mV) / slope_mV_per_W
-                    if p_w < 0.0:
-                        p_w = 0.0
-                    out_list.append(round(p_w, decimals))
-
-            return power_ch
+            p_w = None
+            if _linear_adc_to_W is not None:
+                try:
+                    # fused ADC->W: no intermediate mV arrays at all
+                    _linear_adc_to_W(adc, zero, lsb_mV, inv_slope, intercept, thr, out)
+                    p_w = out
+                except Exception:
+                    p_w = None
+
+            if p_w is None:
+                # affine form: one FMA-shaped stream instead of separate
+                # zero/scale/intercept/slope passes
+                A = self._cal_A_np[np.arange(4), g][:, None]
+                B = self._cal_B_np[np.arange(4), g][:, None]
+                p_w = adc.T * A + B
+                np.maximum(p_w, 0.0, out=p_w)
+                if thr > 0.0:
+                    mv_arr = (adc.T.astype(np.float64) - zero[:, None]) * lsb_mV
+                    p_w[np.abs(mv_arr) < thr] = 0.0
+
+            if round_output:
+                decimals = self._decimals_np[np.arange(4), g]
+                for ch_idx in range(4):
+                    np.round(p_w[ch_idx], int(decimals[ch_idx]), out=out[ch_idx])
+            elif p_w is not out:
+                out[:] = p_w
+            return out
 
         if self._frontend_type == self.FRONTEND_LOG:
-            v_ch = self.transfer_frames_volts(frames, use_zero=None)
+            if self._loglut_xs_np is None or self._loglut_ys_np is None:
+                raise CoreDAQError("LOG LUT not loaded")
+
+            ch = self.transfer_frames_adc(frames)
             db = self._log_deadband_mV if log_deadband_mV is None else float(log_deadband_mV)
+            lsb_mV = self.ADC_LSB_MV
 
-            power_ch: List[List[float]] = [[], [], [], []]
+            out = self._power_buffer(frames)
+            scratch = np.empty(frames, dtype=np.float64)
             for ch_idx in range(4):
-                out_list = power_ch[ch_idx]
-                for v in v_ch[ch_idx]:
-                    mv_equiv = v * 1e3
-                    if db > 0.0 and abs(mv_equiv) < db:
-                        out_list.append(0.0)
-                    else:
-                        out_list.append(float(self.voltage_to_power_W(v)))
-            return power_ch
+                mv = ch[ch_idx] * lsb_mV  # float64
+
+                if _log_convert is not None:
+                    _log_convert(self._loglut_xs_np, self._loglut_ys_np,
+                                 mv, db, scratch)
+                    out[ch_idx, :] = scratch
+                else:
+                    p = self.voltage_to_power_W_array(mv * 1e-3)
+                    if db > 0.0:
+                        p *= (np.abs(mv) >= db)
+                    out[ch_idx, :] = p
+            return out
 
         raise CoreDAQError(f"Unknown frontend type: {self._frontend_type}")
 
@@ -1025,36 +1477,57 @@ class CoreDAQ:
 
     # ---------- Sensors ----------
     def get_head_temperature_C(self) -> float:
-        with self._lock:
-            self._writeln("TEMP?")
-            line = self._readline()
-        if not line.startswith("OK"):
-            raise CoreDAQError(f"TEMP? error: {line}")
-        val = line[3:].strip()
+        st, val = self._ask("TEMP?")
+        if st != "OK":
+            raise CoreDAQError(f"TEMP? error: {val}")
         try:
             return float(val)
         except ValueError:
             raise CoreDAQError(f"Bad TEMP format: '{val}'")
 
     def get_head_humidity(self) -> float:
-        with self._lock:
-            self._writeln("HUM?")
-            line = self._readline()
-        if not line.startswith("OK"):
-            raise CoreDAQError(f"HUM? error: {line}")
-        val = line[3:].strip()
+        st, val = self._ask("HUM?")
+        if st != "OK":
+            raise CoreDAQError(f"HUM? error: {val}")
         try:
             return float(val)
         except ValueError:
             raise CoreDAQError(f"Bad HUM format: '{val}'")
 
+    def get_env(self) -> Tuple[float, float, float]:
+        """
+        Reads all environmental sensors in one round-trip.
+
+        Firmware command:
+          ENV?
+        Response:
+          OK <head_temp_C> <head_humidity_pct> <die_temp_C>
+
+        Returns:
+          (head_temp_C, head_humidity_pct, die_temp_C)
+
+        Falls back to the three individual queries on firmware that does
+        not implement ENV? (three round-trips instead of one).
+        """
+        st, payload = self._ask("ENV?")
+        if st == "OK":
+            parts = payload.split()
+            if len(parts) >= 3:
+                try:
+                    return (float(parts[0]), float(parts[1]), float(parts[2]))
+                except ValueError:
+                    raise CoreDAQError(f"Bad ENV? payload: {payload!r}")
+
+        return (
+            self.get_head_temperature_C(),
+            self.get_head_humidity(),
+            self.get_die_temperature_C(),
+        )
+
     def get_die_temperature_C(self) -> float:
-        with self._lock:
-            self._writeln("DIE_TEMP?")
-            line = self._readline()
-        if not line.startswith("OK"):
-            raise CoreDAQError(f"DIE_TEMP? error: {line}")
-        val = line[3:].strip()
+        st, val = self._ask("DIE_TEMP?")
+        if st != "OK":
+            raise CoreDAQError(f"DIE_TEMP? error: {val}")
         try:
             return float(val)
         except ValueError:
@@ -1122,17 +1595,19 @@ class CoreDAQ:
             except Exception:
                 return False
 
-        ports = list(serial.tools.list_ports.comports())
-        found = []
+        def _probe_all(devices):
+            # Probe ports concurrently: each probe blocks on serial I/O
+            # (GIL released), so enumeration costs ~one timeout, not N.
+            if len(devices) <= 1:
+                return [d for d in devices if _probe_idn(d)]
+            with ThreadPoolExecutor(max_workers=min(len(devices), 16)) as ex:
+                hits = list(ex.map(_probe_idn, devices))
+            return [d for d, hit in zip(devices, hits) if hit]
 
-        for p in ports:
-            if _descriptor_match(p):
-                if _probe_idn(p.device):
-                    found.append(p.device)
+        ports = list(serial.tools.list_ports.comports())
 
+        found = _probe_all([p.device for p in ports if _descriptor_match(p)])
         if not found:
-            for p in ports:
-                if _probe_idn(p.device):
-                    found.append(p.device)
+            found = _probe_all([p.device for p in ports])
 
         return found
\ No newline at end of file
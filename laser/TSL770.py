@@ -174,17 +174,13 @@ class TSL770:
         -------
         None.
         """
-        # set the starting wavelength value of the sweep in nanometers
-        self.instrument.write(":WAV:SWE:STAR {}".format(start_lim)) 
-        
-        # set the ending wavelength value of the sweep in nanometers
-        self.instrument.write(":WAV:SWE:STOP {}".format(end_lim))
-        
-        # set the sweep mode to use
-        self.instrument.write(":WAV:SWE:MOD {}".format(mode))
-        
-        # set the dwell time for the sweep in seconds
-        self.instrument.write(":WAV:SWE:DWEL {}".format(dwel_time))
+        # set start/stop wavelength (nm), sweep mode and dwell time (s)
+        # in one chained SCPI write: one GPIB transaction instead of four
+        self.instrument.write(
+            ":WAV:SWE:STAR {};:WAV:SWE:STOP {};:WAV:SWE:MOD {};:WAV:SWE:DWEL {}".format(
+                start_lim, end_lim, mode, dwel_time
+            )
+        )
         
         
     def set_sweep_cycles(self, cycles):
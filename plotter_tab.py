@@ -1,473 +1,797 @@
-# plotter_tab.py
-
-from __future__ import annotations
-
-from typing import List, Optional
-
-import numpy as np
-from PyQt5 import QtCore, QtGui, QtWidgets
-import pyqtgraph as pg
-
-from channels import ChannelManager, ChannelConfig
-
-# live plotting params
-WINDOW_SECONDS = 5.0      # time window length (s)
-UPDATE_HZ = 50.0          # snapshot polling rate (Hz)
-SAMPLES_PER_WINDOW = int(WINDOW_SECONDS * UPDATE_HZ)
-
-pg.setConfigOptions(antialias=True)
-
-
-class PlotterWidget(QtWidgets.QWidget):
-    """
-    Live plotter tab.
-
-    Uses a shared CoreDAQ instance passed from main.
-    Does not open/close the device itself.
-    """
-
-    def __init__(self, manager: ChannelManager, daq=None, parent=None):
-        super().__init__(parent)
-        self.manager = manager
-        self.daq = daq
-
-        self.setObjectName("PlotterContainer")
-
-        # ring buffer of *physical* channels: 4 x N (W)
-        self.N = max(1, SAMPLES_PER_WINDOW)
-        self.buf_phys = np.zeros((4, self.N), dtype=np.float32)
-        self.widx = 0
-        self.filled = 0
-        self.tbase = np.linspace(-WINDOW_SECONDS, 0.0, self.N, dtype=np.float32)
-
-        # logical channel cards
-        self.cards: List[dict] = []
-
-        # gain / autogain state
-        self.autogain_enabled = False
-        self.manual_gains = [0, 0, 0, 0]   # last manual gains per physical head
-        self.gain_combos: List[Optional[QtWidgets.QComboBox]] = [None, None, None, None]
-
-        # timer
-        self.timer = QtCore.QTimer(self)
-        self.timer.timeout.connect(self._update_live)
-
-        self._build_ui()
-        self.on_channels_updated()
-
-    # ------------------------------------------------------------------
-    # Public API called from main.py
-    # ------------------------------------------------------------------
-    def set_daq(self, daq):
-        """Inject / replace shared CoreDAQ instance."""
-        self.daq = daq
-
-    def set_active(self, active: bool):
-        """Start/stop live polling."""
-        if active:
-            if not self.timer.isActive():
-                interval_ms = int(1000.0 / UPDATE_HZ)
-                self.timer.start(max(5, interval_ms))
-        else:
-            self.timer.stop()
-
-    def on_channels_updated(self):
-        """Rebuild cards when channel configuration changes."""
-        # clear existing
-        while self.grid.count():
-            item = self.grid.takeAt(0)
-            w = item.widget()
-            if w is not None:
-                w.deleteLater()
-        self.cards.clear()
-        self.gain_combos = [None, None, None, None]
-
-        display_channels = self.manager.get_display_channels()
-        if not display_channels:
-            return
-
-        axis_font = QtGui.QFont()
-        axis_font.setPointSize(8)
-
-        colors = [
-            "#ffffff",
-            "#00E5FF",
-            "#FFD740",
-            "#69F0AE",
-            "#FF4081",
-            "#7C4DFF",
-            "#FF6E40",
-            "#64FFDA",
-        ]
-
-        for idx, cfg in enumerate(display_channels):
-            row = idx // 2
-            col = idx % 2
-
-            frame = QtWidgets.QFrame(self.inner)
-            frame.setObjectName("ChannelCard")
-            frame_layout = QtWidgets.QVBoxLayout(frame)
-            frame_layout.setContentsMargins(10, 8, 10, 10)
-            frame_layout.setSpacing(4)
-
-            # ---- header: name + value ----
-            header = QtWidgets.QHBoxLayout()
-            header.setContentsMargins(0, 0, 0, 0)
-            header.setSpacing(6)
-
-            name_label = QtWidgets.QLabel(cfg.name)
-            name_font = name_label.font()
-            name_font.setPointSize(int(name_font.pointSize() * 1.3))
-            name_font.setBold(True)
-            name_label.setFont(name_font)
-            name_label.setStyleSheet("color: #ffffff;")
-            header.addWidget(name_label)
-
-            header.addStretch(1)
-
-            value_label = QtWidgets.QLabel("0.0 W")
-            value_font = value_label.font()
-            value_font.setPointSize(int(value_font.pointSize() * 1.1))
-            value_label.setFont(value_font)
-            value_label.setStyleSheet("color: #ffffff;")
-            header.addWidget(value_label)
-
-            frame_layout.addLayout(header)
-
-            # ---- optional gain row for physical channels ----
-            gain_combo = None
-            if cfg.kind == "physical":
-                phys_idx = cfg.index or 0
-                gain_row = QtWidgets.QHBoxLayout()
-                gain_row.setContentsMargins(0, 0, 0, 0)
-                gain_row.setSpacing(6)
-
-                gain_label = QtWidgets.QLabel("Gain")
-                gain_label.setStyleSheet("color: #bbbbbb;")
-                gain_row.addWidget(gain_label)
-
-                combo = QtWidgets.QComboBox()
-                combo.setMinimumWidth(80)
-                # human-readable labels if available
-                try:
-                    from coredaq_py_api import CoreDAQ  # local import
-                    labels = getattr(CoreDAQ, "GAIN_LABELS", None)
-                except Exception:
-                    labels = None
-                if labels is not None and len(labels) >= 8:
-                    for g in range(8):
-                        combo.addItem(labels[g], g)
-                else:
-                    for g in range(8):
-                        combo.addItem(f"G{g}", g)
-                combo.setCurrentIndex(0)
-                combo.currentIndexChanged[int].connect(
-                    lambda value, idx=phys_idx: self._on_gain_changed(idx, value)
-                )
-                gain_row.addWidget(combo)
-                gain_row.addStretch(1)
-
-                frame_layout.addLayout(gain_row)
-
-                self.gain_combos[phys_idx] = combo
-
-            # ---- plot ----
-            pw = pg.PlotWidget(background="k")
-            pw.setMenuEnabled(False)
-            pw.showGrid(x=True, y=True, alpha=0.15)
-            pw.setLabel("bottom", "Time", units="s")
-            if cfg.kind == "relative":
-                pw.setLabel("left", "Relative (dB)")
-            else:
-                pw.setLabel("left", "Power", units="W")
-
-            left_axis = pw.getAxis("left")
-            bottom_axis = pw.getAxis("bottom")
-            left_axis.setStyle(tickFont=axis_font)
-            bottom_axis.setStyle(tickFont=axis_font)
-            left_axis.setPen(pg.mkPen("#bbbbbb"))
-            bottom_axis.setPen(pg.mkPen("#bbbbbb"))
-
-            color = colors[idx % len(colors)]
-            curve = pw.plot(
-                pen=pg.mkPen(color, width=2),
-                clipToView=True,
-            )
-
-            frame_layout.addWidget(pw, 1)
-            self.grid.addWidget(frame, row, col)
-
-            self.cards.append(
-                {
-                    "cfg": cfg,
-                    "frame": frame,
-                    "plot": pw,
-                    "curve": curve,
-                    "value_label": value_label,
-                }
-            )
-
-        # allow extra stretch at bottom
-        self.grid.setRowStretch((len(display_channels) + 1) // 2 + 1, 1)
-
-    # ------------------------------------------------------------------
-    # UI build
-    # ------------------------------------------------------------------
-    def _build_ui(self):
-        outer = QtWidgets.QVBoxLayout(self)
-        outer.setContentsMargins(8, 8, 8, 8)
-        outer.setSpacing(6)
-
-        # ---- top bar: title + Autogain ----
-        top_row = QtWidgets.QHBoxLayout()
-        top_row.setContentsMargins(0, 0, 0, 0)
-        top_row.setSpacing(8)
-
-        title = QtWidgets.QLabel("Plotter")
-        t_font = title.font()
-        t_font.setPointSize(int(t_font.pointSize() * 1.4))
-        t_font.setBold(True)
-        title.setFont(t_font)
-        title.setStyleSheet("color: #ffffff;")
-        top_row.addWidget(title)
-
-        top_row.addStretch(1)
-
-        self.chk_autogain = QtWidgets.QCheckBox("Autogain")
-        self.chk_autogain.setToolTip("Use snapshot_autogain_W instead of manual gains")
-        self.chk_autogain.stateChanged.connect(self._on_autogain_toggled)
-        top_row.addWidget(self.chk_autogain)
-
-        outer.addLayout(top_row)
-
-        # ---- scroll area for cards ----
-        self.scroll = QtWidgets.QScrollArea(self)
-        self.scroll.setWidgetResizable(True)
-        self.scroll.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOff)
-        outer.addWidget(self.scroll, 1)
-
-        self.inner = QtWidgets.QWidget()
-        self.scroll.setWidget(self.inner)
-
-        self.grid = QtWidgets.QGridLayout(self.inner)
-        self.grid.setContentsMargins(12, 12, 12, 12)
-        self.grid.setSpacing(12)
-
-    # ------------------------------------------------------------------
-    # Autogain / gain handling
-    # ------------------------------------------------------------------
-    def _on_autogain_toggled(self, state: int):
-        enabled = state == QtCore.Qt.Checked
-        self.autogain_enabled = enabled
-
-        # enable/disable combos visually
-        for combo in self.gain_combos:
-            if combo is not None:
-                combo.setEnabled(not enabled)
-
-        if enabled:
-            # read current gains from device as "manual" snapshot
-            if self.daq is not None:
-                try:
-                    g1, g2, g3, g4 = self.daq.get_gains()
-                    self.manual_gains = [int(g1), int(g2), int(g3), int(g4)]
-                except Exception:
-                    # fall back to combo indices
-                    self.manual_gains = [
-                        c.currentIndex() if c is not None else 0
-                        for c in self.gain_combos
-                    ]
-        else:
-            # restore manual gains to device
-            if self.daq is not None:
-                try:
-                    for head, g in enumerate(self.manual_gains, start=1):
-                        self.daq.set_gain(head, int(g))
-                    # sync combos
-                    for i, combo in enumerate(self.gain_combos):
-                        if combo is not None:
-                            combo.blockSignals(True)
-                            combo.setCurrentIndex(int(self.manual_gains[i]))
-                            combo.blockSignals(False)
-                except Exception:
-                    pass
-
-    def _on_gain_changed(self, phys_idx: int, value: int):
-        if self.daq is None or self.autogain_enabled:
-            return
-        try:
-            self.daq.set_gain(phys_idx + 1, int(value))
-            self.manual_gains[phys_idx] = int(value)
-        except Exception:
-            pass
-
-    # ------------------------------------------------------------------
-    # Live polling
-    # ------------------------------------------------------------------
-    @QtCore.pyqtSlot()
-    def _update_live(self):
-        if self.daq is None:
-            return
-
-        # ---- 1) get latest physical powers in W ----
-        try:
-            # Autogain rules (LINEAR only):
-            #   if |mV| < 50   -> increase gain (if g < 7)
-            #   if |mV| > 4500 -> decrease gain (if g > 0)
-            #
-            # In the new CoreDAQ API, this is done via snapshot_W(autogain=True, return_debug=True).
-            if self.autogain_enabled and getattr(self.daq, "frontend_type", lambda: "")() == "LINEAR":
-                power_W, mv_final, gains_final = self.daq.snapshot_W(
-                    n_frames=1,
-                    timeout_s=0.5,
-                    poll_hz=200.0,
-                    autogain=True,
-                    min_mv=50.0,
-                    max_mv=4500.0,
-                    max_iters=8,
-                    settle_s=0.01,
-                    return_debug=True,
-                )
-
-                # update combos to reflect autogain-chosen gains
-                for i, g in enumerate(gains_final):
-                    gi = int(g)
-                    if 0 <= gi <= 7 and self.gain_combos[i] is not None:
-                        c = self.gain_combos[i]
-                        c.blockSignals(True)
-                        c.setCurrentIndex(gi)
-                        c.blockSignals(False)
-
-            else:
-                # LOG front-end (or autogain disabled): simple snapshot
-                power_W = self.daq.snapshot_W(
-                    n_frames=1,
-                    timeout_s=0.5,
-                    poll_hz=200.0,
-                )
-
-        except Exception:
-            return
-
-        phys = np.zeros(4, dtype=np.float32)
-        power_W = list(power_W)
-        for i in range(min(4, len(power_W))):
-            phys[i] = float(power_W[i])
-
-        # ---- 2) push into ring buffer ----
-        self.buf_phys[:, self.widx] = phys
-        self.widx += 1
-        if self.widx >= self.N:
-            self.widx = 0
-        if self.filled < self.N:
-            self.filled += 1
-
-        count = self.filled
-        if count <= 0:
-            return
-
-        N = self.N
-        start = (self.widx - count) % N
-        xs = self.tbase[-count:]
-
-        if start + count <= N:
-            phys_hist = self.buf_phys[:, start:start + count]
-        else:
-            first = N - start
-            phys_hist = np.concatenate(
-                (self.buf_phys[:, start:N], self.buf_phys[:, 0:count - first]),
-                axis=1,
-            )
-
-        # ---- 3) update each logical channel card ----
-        for card in self.cards:
-            cfg: ChannelConfig = card["cfg"]
-
-            if cfg.kind == "physical":
-                idx = cfg.index or 0
-                ys = phys_hist[idx, :]
-            elif cfg.kind == "math":
-                if hasattr(self.manager, "eval_math_array"):
-                    ys = self.manager.eval_math_array(cfg, [phys_hist[i, :] for i in range(4)])
-                else:
-                    vals = []
-                    for k in range(count):
-                        v = self.manager.eval_math_value(cfg, [phys_hist[i, k] for i in range(4)])
-                        vals.append(v)
-                    ys = np.asarray(vals, dtype=np.float32)
-            elif cfg.kind == "relative":
-                if hasattr(self.manager, "eval_relative_array"):
-                    ys = self.manager.eval_relative_array(cfg, [phys_hist[i, :] for i in range(4)])
-                else:
-                    vals = []
-                    for k in range(count):
-                        v = self.manager.eval_relative_value(cfg, [phys_hist[i, k] for i in range(4)])
-                        vals.append(v)
-                    ys = np.asarray(vals, dtype=np.float32)
-            else:
-                ys = np.zeros(count, dtype=np.float32)
-
-            ys = np.asarray(ys, dtype=np.float32)
-            if ys.shape[0] != count:
-                ys = np.resize(ys, (count,))
-
-            # update plot
-            curve = card["curve"]
-            plot = card["plot"]
-            curve.setData(xs, ys, skipFiniteCheck=True)
-
-            # update header value label
-            latest = float(ys[-1]) if ys.size else 0.0
-            txt = self._format_power_label(latest, cfg)
-            card["value_label"].setText(txt)
-
-            # y-range autoscale
-            ymin = float(np.nanmin(ys))
-            ymax = float(np.nanmax(ys))
-            if not np.isfinite(ymin) or not np.isfinite(ymax):
-                continue
-
-            span = ymax - ymin
-            if span <= 0:
-                span = max(1e-9, abs(ymax) * 0.2)
-            pad = 0.3 * span
-            lo = ymin - pad
-            hi = ymax + pad
-
-            if cfg.kind != "relative":
-                lo = max(0.0, lo)
-
-            if hi <= lo:
-                hi = lo + span if span > 0 else lo + 1e-3
-
-            plot.setYRange(lo, hi, padding=0)
-            plot.setXRange(-WINDOW_SECONDS, 0.0, padding=0)
-
-    # ------------------------------------------------------------------
-    # Helpers
-    # ------------------------------------------------------------------
-    def _format_power_label(self, value_W: float, cfg: ChannelConfig) -> str:
-        """Return human-friendly power / dB label."""
-        if cfg.kind == "relative":
-            if not np.isfinite(value_W):
-                return "— dB"
-            return f"{value_W:.2f} dB"
-
-        # power
-        v = abs(value_W)
-        unit = "W"
-        scale = 1.0
-        if v < 1e-9:
-            unit = "W"
-            scale = 1.0
-        elif v < 1e-6:
-            unit = "nW"
-            scale = 1e9
-        elif v < 1e-3:
-            unit = "µW"
-            scale = 1e6
-        elif v < 1.0:
-            unit = "mW"
-            scale = 1e3
-
-        return f"{value_W * scale:,.3g} {unit}"
+# plotter_tab.py
+
+from __future__ import annotations
+
+import time
+from typing import List, Optional, Tuple
+
+import numpy as np
+from PyQt5 import QtCore, QtGui, QtWidgets
+import pyqtgraph as pg
+
+from channels import ChannelManager, ChannelConfig, linear_coeffs
+
+# Optional: numba fuses the per-sample ring append + unwrap copy into
+# one compiled function instead of ~10 NumPy/interpreter dispatches.
+try:
+    import numba
+except Exception:  # pragma: no cover
+    numba = None  # type: ignore
+
+# live plotting params
+WINDOW_SECONDS = 5.0      # time window length (s)
+UPDATE_HZ = 50.0          # snapshot polling rate (Hz)
+SAMPLES_PER_WINDOW = int(WINDOW_SECONDS * UPDATE_HZ)
+
+# CPU-rasterized antialiased wide lines are pyqtgraph's documented slow
+# path; draw thin aliased lines and move rasterization to the GPU when
+# PyOpenGL is available.
+try:
+    import OpenGL  # noqa: F401
+
+    pg.setConfigOptions(antialias=False, useOpenGL=True, enableExperimental=True)
+except ImportError:
+    pg.setConfigOptions(antialias=False)
+
+
+if numba is not None:
+    @numba.njit(cache=True, fastmath=True)
+    def _ring_step(buf, unwrap, widx, filled, sample):  # pragma: no cover
+        """Append one sample, advance the ring and unwrap if needed.
+
+        Returns (widx, filled, wrapped); when wrapped is True the
+        contiguous history is in unwrap[:, :filled], otherwise it is a
+        plain slice of buf.
+        """
+        n = buf.shape[1]
+        for ch in range(buf.shape[0]):
+            buf[ch, widx] = sample[ch]
+        widx += 1
+        if widx >= n:
+            widx = 0
+        if filled < n:
+            filled += 1
+        start = widx - filled
+        if start < 0:
+            start += n
+        wrapped = start + filled > n
+        if wrapped:
+            first = n - start
+            for ch in range(buf.shape[0]):
+                for j in range(first):
+                    unwrap[ch, j] = buf[ch, start + j]
+                for j in range(filled - first):
+                    unwrap[ch, first + j] = buf[ch, j]
+        return widx, filled, wrapped
+else:
+    _ring_step = None
+
+
+# float32 constants for the autoscale math: Python float literals would
+# silently promote every per-card scalar op to float64
+_F32_0 = np.float32(0.0)
+_F32_02 = np.float32(0.2)
+_F32_03 = np.float32(0.3)
+_F32_1E9 = np.float32(1e-9)
+_F32_1E3 = np.float32(1e-3)
+
+# power-label unit table: first row whose bound exceeds |value| wins
+# (sub-nanowatt readings are noise and stay in plain W)
+_POWER_TABLE = (
+    (1e-9, 1.0, "W"),
+    (1e-6, 1e9, "nW"),
+    (1e-3, 1e6, "µW"),
+    (1.0, 1e3, "mW"),
+    (float("inf"), 1.0, "W"),
+)
+
+
+# curve colour cycle for channel cards
+_CURVE_COLORS = (
+    "#ffffff",
+    "#00E5FF",
+    "#FFD740",
+    "#69F0AE",
+    "#FF4081",
+    "#7C4DFF",
+    "#FF6E40",
+    "#64FFDA",
+)
+
+
+class _SnapshotWorker(QtCore.QObject):
+    """Polls daq.snapshot_W at UPDATE_HZ on its own thread.
+
+    Serial latency, retries and autogain settling are absorbed here
+    instead of blocking the GUI event loop; each sample crosses to the
+    widget through a queued signal.
+    """
+
+    sample_ready = QtCore.pyqtSignal(object, object)  # (power_W, gains | None)
+
+    def __init__(self, plotter: "PlotterWidget"):
+        super().__init__()
+        self._plotter = plotter
+        self._run = True
+
+    def stop(self):
+        self._run = False
+
+    def run(self):
+        period = 1.0 / UPDATE_HZ
+        next_t = time.monotonic()
+        while self._run:
+            self._poll_once()
+            next_t += period
+            delay = next_t - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                # fell behind (slow serial turn-around); restart cadence
+                next_t = time.monotonic()
+
+    def _poll_once(self):
+        p = self._plotter
+        daq = p.daq
+        if daq is None:
+            return
+
+        try:
+            # Autogain rules (LINEAR only):
+            #   if |mV| < 50   -> increase gain (if g < 7)
+            #   if |mV| > 4500 -> decrease gain (if g > 0)
+            if p.autogain_enabled and getattr(daq, "frontend_type", lambda: "")() == "LINEAR":
+                power_W, mv_final, gains_final = daq.snapshot_W(
+                    n_frames=1,
+                    timeout_s=0.5,
+                    poll_hz=200.0,
+                    autogain=True,
+                    min_mv=50.0,
+                    max_mv=4500.0,
+                    max_iters=8,
+                    settle_s=0.01,
+                    return_debug=True,
+                )
+            else:
+                # LOG front-end (or autogain disabled): simple snapshot
+                power_W = daq.snapshot_W(
+                    n_frames=1,
+                    timeout_s=0.5,
+                    poll_hz=200.0,
+                )
+                gains_final = None
+        except Exception:
+            return
+
+        self.sample_ready.emit(power_W, gains_final)
+
+
+class PlotterWidget(QtWidgets.QWidget):
+    """
+    Live plotter tab.
+
+    Uses a shared CoreDAQ instance passed from main.
+    Does not open/close the device itself.
+    """
+
+    def __init__(self, manager: ChannelManager, daq=None, parent=None):
+        super().__init__(parent)
+        self.manager = manager
+        self.daq = daq
+
+        self.setObjectName("PlotterContainer")
+
+        # ring buffer of *physical* channels: 4 x N (W)
+        self.N = max(1, SAMPLES_PER_WINDOW)
+        self.buf_phys = np.zeros((4, self.N), dtype=np.float32)
+        # persistent unwrap target: when the ring has wrapped, the two
+        # halves are copied here in place so downstream code always sees
+        # a contiguous array at a stable base address (no per-tick
+        # np.concatenate allocation)
+        self._unwrap = np.empty((4, self.N), dtype=np.float32)
+        # per-sample scratch, reused instead of allocated every tick
+        self._phys_scratch = np.zeros(4, dtype=np.float32)
+        self.widx = 0
+        self.filled = 0
+        self.tbase = np.linspace(-WINDOW_SECONDS, 0.0, self.N, dtype=np.float32)
+
+        # logical channel cards
+        self.cards: List[dict] = []
+
+        # batched evaluation of linear math cards: one (K, 4) @ (4, N)
+        # product per tick instead of K separate expression evals
+        self._math_A: Optional[np.ndarray] = None
+        self._math_b: Optional[np.ndarray] = None
+
+        # batched relative cards: all dB ratios in one divide/log pass
+        self._rel_num: Optional[np.ndarray] = None
+        self._rel_den: Optional[np.ndarray] = None
+        self._rel_scratch: Optional[np.ndarray] = None
+
+        # gain / autogain state
+        self.autogain_enabled = False
+        self.manual_gains = [0, 0, 0, 0]   # last manual gains per physical head
+        self.gain_combos: List[Optional[QtWidgets.QComboBox]] = [None, None, None, None]
+        # last autogain indices pushed into the combos; steady state
+        # then skips the Qt calls entirely
+        self._last_gains_displayed = [-1, -1, -1, -1]
+
+        # snapshot worker (created on demand by set_active)
+        self._worker: Optional[_SnapshotWorker] = None
+        self._worker_thread: Optional[QtCore.QThread] = None
+        self._resume_on_show = False
+
+        self._build_ui()
+        self.on_channels_updated()
+
+    # ------------------------------------------------------------------
+    # Public API called from main.py
+    # ------------------------------------------------------------------
+    def set_daq(self, daq):
+        """Inject / replace shared CoreDAQ instance."""
+        self.daq = daq
+
+    def set_active(self, active: bool):
+        """Start/stop the live polling worker."""
+        if active:
+            if self._worker_thread is None:
+                self._worker = _SnapshotWorker(self)
+                self._worker_thread = QtCore.QThread(self)
+                self._worker.moveToThread(self._worker_thread)
+                self._worker_thread.started.connect(self._worker.run)
+                self._worker.sample_ready.connect(
+                    self._on_sample, QtCore.Qt.QueuedConnection
+                )
+                self._worker_thread.start()
+        else:
+            if self._worker_thread is not None:
+                self._worker.stop()
+                self._worker_thread.quit()
+                self._worker_thread.wait(1000)
+                self._worker = None
+                self._worker_thread = None
+
+    def hideEvent(self, ev):
+        # No point polling the device while the tab is off screen;
+        # remember whether we were running so showEvent can resume.
+        self._resume_on_show = self._worker_thread is not None
+        self.set_active(False)
+        super().hideEvent(ev)
+
+    def showEvent(self, ev):
+        super().showEvent(ev)
+        if self._resume_on_show:
+            self._resume_on_show = False
+            self.set_active(True)
+
+    @staticmethod
+    def _card_key(cfg: ChannelConfig):
+        """Identity of a card: configs matching this key reuse widgets."""
+        return (cfg.kind, cfg.name, cfg.index, cfg.expression, cfg.rel_src_indices)
+
+    def on_channels_updated(self):
+        """Sync cards with the channel configuration.
+
+        The new channel list is diffed against the existing cards:
+        unchanged cards keep their widgets and are only repositioned in
+        the grid, so toggling one channel costs O(changed) widget work
+        instead of a full teardown and rebuild.
+        """
+        display_channels = self.manager.get_display_channels()
+
+        old_by_key: dict = {}
+        for card in self.cards:
+            old_by_key.setdefault(card["key"], []).append(card)
+
+        # detach everything from the grid; survivors are re-added at
+        # their new positions below
+        while self.grid.count():
+            self.grid.takeAt(0)
+
+        self.gain_combos = [None, None, None, None]
+        self._math_A = None
+        self._math_b = None
+        self._rel_num = None
+        self._rel_den = None
+        self._last_gains_displayed = [-1, -1, -1, -1]
+        math_rows: List[tuple] = []
+        rel_pairs: List[Tuple[int, int]] = []
+
+        new_cards: List[dict] = []
+        for idx, cfg in enumerate(display_channels):
+            bucket = old_by_key.get(self._card_key(cfg))
+            if bucket:
+                card = bucket.pop(0)
+                card["cfg"] = cfg
+            else:
+                card = self._create_card(cfg, idx)
+
+            self.grid.addWidget(card["frame"], idx // 2, idx % 2)
+
+            # hot-loop dispatch, recomputed on every sync: batch rows
+            # and combo registration depend on the current card set
+            batch_row = None
+            rel_row = None
+            src_idx = None
+            eval_fn = None
+            if cfg.kind == "physical":
+                src_idx = cfg.index or 0
+                self.gain_combos[src_idx] = card["gain_combo"]
+            elif cfg.kind == "math":
+                # linear combinations are served from one shared matrix
+                # product; anything else falls back to per-card eval
+                coeffs = linear_coeffs(cfg.expression or "")
+                if coeffs is not None:
+                    batch_row = len(math_rows)
+                    math_rows.append(coeffs)
+                else:
+                    eval_fn = self.manager.eval_math_array
+            elif cfg.kind == "relative":
+                if cfg.rel_src_indices is not None:
+                    rel_row = len(rel_pairs)
+                    rel_pairs.append(cfg.rel_src_indices)
+                else:
+                    eval_fn = self.manager.eval_relative_array
+
+            card["phys_idx"] = src_idx
+            card["eval_fn"] = eval_fn
+            card["batch_row"] = batch_row
+            card["rel_row"] = rel_row
+            new_cards.append(card)
+
+        # tear down only the cards that actually disappeared
+        for bucket in old_by_key.values():
+            for card in bucket:
+                card["frame"].deleteLater()
+
+        self.cards = new_cards
+
+        if math_rows:
+            arr = np.asarray(math_rows, dtype=np.float32)
+            self._math_A = np.ascontiguousarray(arr[:, :4])
+            self._math_b = np.ascontiguousarray(arr[:, 4:5])  # (K, 1)
+
+        if rel_pairs:
+            pairs = np.asarray(rel_pairs, dtype=np.intp)
+            self._rel_num = pairs[:, 0]
+            self._rel_den = pairs[:, 1]
+
+        # allow extra stretch at bottom
+        self.grid.setRowStretch((len(display_channels) + 1) // 2 + 1, 1)
+
+    def _create_card(self, cfg: ChannelConfig, idx: int) -> dict:
+        """Build the widgets and state dict for one channel card."""
+        axis_font = QtGui.QFont()
+        axis_font.setPointSize(8)
+
+        frame = QtWidgets.QFrame(self.inner)
+        frame.setObjectName("ChannelCard")
+        frame_layout = QtWidgets.QVBoxLayout(frame)
+        frame_layout.setContentsMargins(10, 8, 10, 10)
+        frame_layout.setSpacing(4)
+
+        # ---- header: name + value ----
+        header = QtWidgets.QHBoxLayout()
+        header.setContentsMargins(0, 0, 0, 0)
+        header.setSpacing(6)
+
+        name_label = QtWidgets.QLabel(cfg.name)
+        name_font = name_label.font()
+        name_font.setPointSize(int(name_font.pointSize() * 1.3))
+        name_font.setBold(True)
+        name_label.setFont(name_font)
+        name_label.setStyleSheet("color: #ffffff;")
+        header.addWidget(name_label)
+
+        header.addStretch(1)
+
+        value_label = QtWidgets.QLabel("0.0 W")
+        value_font = value_label.font()
+        value_font.setPointSize(int(value_font.pointSize() * 1.1))
+        value_label.setFont(value_font)
+        value_label.setStyleSheet("color: #ffffff;")
+        header.addWidget(value_label)
+
+        frame_layout.addLayout(header)
+
+        # ---- optional gain row for physical channels ----
+        gain_combo = None
+        if cfg.kind == "physical":
+            phys_idx = cfg.index or 0
+            gain_row = QtWidgets.QHBoxLayout()
+            gain_row.setContentsMargins(0, 0, 0, 0)
+            gain_row.setSpacing(6)
+
+            gain_label = QtWidgets.QLabel("Gain")
+            gain_label.setStyleSheet("color: #bbbbbb;")
+            gain_row.addWidget(gain_label)
+
+            combo = QtWidgets.QComboBox()
+            combo.setMinimumWidth(80)
+            # human-readable labels if available
+            try:
+                from coredaq_py_api import CoreDAQ  # local import
+                labels = getattr(CoreDAQ, "GAIN_LABELS", None)
+            except Exception:
+                labels = None
+            if labels is not None and len(labels) >= 8:
+                for g in range(8):
+                    combo.addItem(labels[g], g)
+            else:
+                for g in range(8):
+                    combo.addItem(f"G{g}", g)
+            combo.setCurrentIndex(0)
+            combo.currentIndexChanged[int].connect(
+                lambda value, idx=phys_idx: self._on_gain_changed(idx, value)
+            )
+            gain_row.addWidget(combo)
+            gain_row.addStretch(1)
+
+            frame_layout.addLayout(gain_row)
+
+            gain_combo = combo
+
+        # ---- plot ----
+        pw = pg.PlotWidget(background="k")
+        pw.setMenuEnabled(False)
+        pw.showGrid(x=True, y=True, alpha=0.15)
+        pw.setLabel("bottom", "Time", units="s")
+        if cfg.kind == "relative":
+            pw.setLabel("left", "Relative (dB)")
+        else:
+            pw.setLabel("left", "Power", units="W")
+
+        left_axis = pw.getAxis("left")
+        bottom_axis = pw.getAxis("bottom")
+        left_axis.setStyle(tickFont=axis_font)
+        bottom_axis.setStyle(tickFont=axis_font)
+        left_axis.setPen(pg.mkPen("#bbbbbb"))
+        bottom_axis.setPen(pg.mkPen("#bbbbbb"))
+
+        # x window is fixed; set it once here instead of every tick
+        pw.setXRange(-WINDOW_SECONDS, 0.0, padding=0)
+
+        # cap rendered points at viewport width and skip offscreen
+        # segments; ranges are program-controlled, so no mouse
+        # interaction (and no viewbox hit-testing) is needed
+        pw.setDownsampling(auto=True, mode="peak")
+        pw.setClipToView(True)
+        pw.setMouseEnabled(x=False, y=False)
+
+        color = _CURVE_COLORS[idx % len(_CURVE_COLORS)]
+        curve = pw.plot(
+            pen=pg.mkPen(color, width=1),
+            clipToView=True,
+        )
+
+        frame_layout.addWidget(pw, 1)
+
+        return {
+            "key": self._card_key(cfg),
+            "cfg": cfg,
+            "frame": frame,
+            "plot": pw,
+            "curve": curve,
+            "value_label": value_label,
+            "gain_combo": gain_combo,
+            "phys_idx": None,
+            "eval_fn": None,
+            "batch_row": None,
+            "rel_row": None,
+            "_ys": np.empty(self.N, dtype=np.float32),
+            "is_rel": cfg.kind == "relative",
+            # physical power comes from the device and is always
+            # finite; math/relative expressions can divide by zero and
+            # need NaN-aware reductions
+            "may_be_nan": cfg.kind != "physical",
+            "_last_y": (None, None),
+            "_last_txt": "",
+            "_label_tick": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # UI build
+    # ------------------------------------------------------------------
+    def _build_ui(self):
+        outer = QtWidgets.QVBoxLayout(self)
+        outer.setContentsMargins(8, 8, 8, 8)
+        outer.setSpacing(6)
+
+        # ---- top bar: title + Autogain ----
+        top_row = QtWidgets.QHBoxLayout()
+        top_row.setContentsMargins(0, 0, 0, 0)
+        top_row.setSpacing(8)
+
+        title = QtWidgets.QLabel("Plotter")
+        t_font = title.font()
+        t_font.setPointSize(int(t_font.pointSize() * 1.4))
+        t_font.setBold(True)
+        title.setFont(t_font)
+        title.setStyleSheet("color: #ffffff;")
+        top_row.addWidget(title)
+
+        top_row.addStretch(1)
+
+        self.chk_autogain = QtWidgets.QCheckBox("Autogain")
+        self.chk_autogain.setToolTip("Use snapshot_autogain_W instead of manual gains")
+        self.chk_autogain.stateChanged.connect(self._on_autogain_toggled)
+        top_row.addWidget(self.chk_autogain)
+
+        outer.addLayout(top_row)
+
+        # ---- scroll area for cards ----
+        self.scroll = QtWidgets.QScrollArea(self)
+        self.scroll.setWidgetResizable(True)
+        self.scroll.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOff)
+        outer.addWidget(self.scroll, 1)
+
+        self.inner = QtWidgets.QWidget()
+        self.scroll.setWidget(self.inner)
+
+        self.grid = QtWidgets.QGridLayout(self.inner)
+        self.grid.setContentsMargins(12, 12, 12, 12)
+        self.grid.setSpacing(12)
+
+    # ------------------------------------------------------------------
+    # Autogain / gain handling
+    # ------------------------------------------------------------------
+    def _on_autogain_toggled(self, state: int):
+        enabled = state == QtCore.Qt.Checked
+        self.autogain_enabled = enabled
+
+        # enable/disable combos visually
+        for combo in self.gain_combos:
+            if combo is not None:
+                combo.setEnabled(not enabled)
+
+        if enabled:
+            # read current gains from device as "manual" snapshot
+            if self.daq is not None:
+                try:
+                    g1, g2, g3, g4 = self.daq.get_gains()
+                    self.manual_gains = [int(g1), int(g2), int(g3), int(g4)]
+                except Exception:
+                    # fall back to combo indices
+                    self.manual_gains = [
+                        c.currentIndex() if c is not None else 0
+                        for c in self.gain_combos
+                    ]
+        else:
+            # restore manual gains to device
+            if self.daq is not None:
+                try:
+                    for head, g in enumerate(self.manual_gains, start=1):
+                        self.daq.set_gain(head, int(g))
+                    # sync combos
+                    for i, combo in enumerate(self.gain_combos):
+                        if combo is not None:
+                            combo.blockSignals(True)
+                            combo.setCurrentIndex(int(self.manual_gains[i]))
+                            combo.blockSignals(False)
+                except Exception:
+                    pass
+
+    def _on_gain_changed(self, phys_idx: int, value: int):
+        if self.daq is None or self.autogain_enabled:
+            return
+        try:
+            self.daq.set_gain(phys_idx + 1, int(value))
+            self.manual_gains[phys_idx] = int(value)
+        except Exception:
+            pass
+
+    # ------------------------------------------------------------------
+    # Live polling
+    # ------------------------------------------------------------------
+    @QtCore.pyqtSlot(object, object)
+    def _on_sample(self, power_W, gains_final):
+        """GUI-thread slot: consume one sample from the snapshot worker."""
+        # ---- 1) sync combos to autogain-chosen gains ----
+        # (only combos whose index actually changed; each setCurrentIndex
+        # is Qt signal plumbing plus a view refresh)
+        if gains_final is not None:
+            last = self._last_gains_displayed
+            for i, g in enumerate(gains_final):
+                gi = int(g)
+                if gi == last[i] or not 0 <= gi <= 7:
+                    continue
+                c = self.gain_combos[i]
+                if c is None:
+                    continue
+                c.blockSignals(True)
+                c.setCurrentIndex(gi)
+                c.blockSignals(False)
+                last[i] = gi
+
+        # ---- 2) push into ring buffer ----
+        arr = np.asarray(power_W, dtype=np.float32).ravel()
+        n = arr.size if arr.size < 4 else 4
+        scratch = self._phys_scratch
+        scratch[:n] = arr[:n]
+        if n < 4:
+            scratch[n:] = 0.0
+        N = self.N
+        if _ring_step is not None:
+            # fused append + unwrap in one compiled call
+            self.widx, self.filled, wrapped = _ring_step(
+                self.buf_phys, self._unwrap, self.widx, self.filled, scratch
+            )
+            count = self.filled
+            xs = self.tbase if count == N else self.tbase[-count:]
+            if wrapped:
+                phys_hist = self._unwrap[:, :count]
+            else:
+                start = (self.widx - count) % N
+                phys_hist = self.buf_phys[:, start:start + count]
+        else:
+            self.buf_phys[:, self.widx] = scratch
+            self.widx += 1
+            if self.widx >= N:
+                self.widx = 0
+            if self.filled < N:
+                self.filled += 1
+
+            count = self.filled
+            start = (self.widx - count) % N
+            # steady state (ring full) reuses the whole time base; only the
+            # fill-up phase needs a fresh tail view
+            xs = self.tbase if count == N else self.tbase[-count:]
+
+            if start + count <= N:
+                phys_hist = self.buf_phys[:, start:start + count]
+            else:
+                first = N - start
+                np.copyto(self._unwrap[:, :first], self.buf_phys[:, start:N])
+                np.copyto(self._unwrap[:, first:count], self.buf_phys[:, 0:count - first])
+                phys_hist = self._unwrap[:, :count]
+
+        # ---- 3) update each logical channel card ----
+        # all linear math cards in one BLAS product
+        math_out = None
+        if self._math_A is not None:
+            math_out = self._math_A @ phys_hist
+            math_out += self._math_b
+
+        # all relative cards in one divide/log pass (same semantics as
+        # eval_relative_array: non-positive samples map to -inf)
+        rel_out = None
+        if self._rel_num is not None:
+            num = phys_hist[self._rel_num]
+            den = phys_hist[self._rel_den]
+            rel_out = self._rel_scratch
+            if rel_out is None or rel_out.shape != num.shape:
+                rel_out = self._rel_scratch = np.empty_like(num)
+            valid = (num > 0) & (den > 0)
+            np.divide(num, den, out=rel_out, where=valid)
+            np.log2(rel_out, out=rel_out, where=valid)
+            np.multiply(rel_out, 3.0102999566398116, out=rel_out, where=valid)
+            rel_out[~valid] = -np.inf
+
+        # updates are disabled on the card container while every
+        # curve/range/label is touched, collapsing the per-card
+        # invalidations into one paint event on re-enable
+        # visible vertical band of the scroll viewport, in card-container
+        # coordinates: cards scrolled out of it skip all draw work (the
+        # ring buffer above is always updated, so nothing is lost)
+        vp_top = self.scroll.verticalScrollBar().value()
+        vp_bot = vp_top + self.scroll.viewport().height()
+
+        # hoist globals/attributes used per card to locals (LOAD_FAST)
+        nanmin = np.nanmin
+        nanmax = np.nanmax
+        isfinite = np.isfinite
+        copyto = np.copyto
+        asarray = np.asarray
+        fmt_label = self._format_power_label
+
+        self.inner.setUpdatesEnabled(False)
+        try:
+            for card in self.cards:
+                cfg: ChannelConfig = card["cfg"]
+
+                geo = card["frame"].geometry()
+                if geo.bottom() < vp_top or geo.top() > vp_bot:
+                    continue
+
+                idx = card["phys_idx"]
+                row = card["batch_row"]
+                rrow = card["rel_row"]
+                if idx is not None:
+                    ys = phys_hist[idx, :]
+                elif row is not None:
+                    ys = math_out[row]
+                elif rrow is not None:
+                    ys = rel_out[rrow]
+                else:
+                    eval_fn = card["eval_fn"]
+                    if eval_fn is not None:
+                        ys = eval_fn(cfg, phys_hist)
+                    else:
+                        ys = np.zeros(count, dtype=np.float32)
+
+                # copy into the card's persistent float32 buffer so setData
+                # always sees a stable array instead of a fresh temporary
+                buf = card["_ys"]
+                ys = asarray(ys)
+                m = count if ys.shape[0] >= count else ys.shape[0]
+                copyto(buf[:m], ys[:m], casting="unsafe")
+                if m < count:
+                    buf[m:count] = 0.0
+                ys = buf[:count]
+
+                # update plot
+                curve = card["curve"]
+                plot = card["plot"]
+                curve.setData(xs, ys, skipFiniteCheck=True)
+
+                # update header value label (~10 Hz is plenty for a human
+                # reader; unchanged text skips the setText relayout)
+                tick = card["_label_tick"] + 1
+                if tick >= 5:
+                    tick = 0
+                    latest = float(ys[-1]) if ys.size else 0.0
+                    txt = fmt_label(latest, cfg)
+                    if txt != card["_last_txt"]:
+                        card["value_label"].setText(txt)
+                        card["_last_txt"] = txt
+                card["_label_tick"] = tick
+
+                # y-range autoscale (single reduction pass per bound; plain
+                # min/max skips the NaN handling for device power channels)
+                if count < 2:
+                    continue
+                if card["may_be_nan"]:
+                    ymin = nanmin(ys)
+                    ymax = nanmax(ys)
+                    if not isfinite(ymin) or not isfinite(ymax):
+                        continue
+                else:
+                    ymin = ys.min()
+                    ymax = ys.max()
+
+                # float32 scalars throughout; cast to Python float only
+                # at the setYRange boundary below
+                span = ymax - ymin
+                if span <= 0:
+                    span = max(_F32_1E9, abs(ymax) * _F32_02)
+                pad = _F32_03 * span
+                lo = ymin - pad
+                hi = ymax + pad
+
+                if not card["is_rel"] and lo < _F32_0:
+                    lo = _F32_0
+
+                if hi <= lo:
+                    hi = lo + span if span > 0 else lo + _F32_1E3
+
+                # Each setYRange triggers a full viewbox update even when
+                # numerically unchanged; only push ranges that moved by more
+                # than 1 % of the previous span. X range is fixed at build.
+                prev_lo, prev_hi = card["_last_y"]
+                if (
+                    prev_lo is None
+                    or abs(lo - prev_lo) + abs(hi - prev_hi)
+                    > 0.01 * (prev_hi - prev_lo)
+                ):
+                    plot.setYRange(float(lo), float(hi), padding=0)
+                    card["_last_y"] = (lo, hi)
+
+        finally:
+            self.inner.setUpdatesEnabled(True)
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+    def _format_power_label(self, value_W: float, cfg: ChannelConfig) -> str:
+        """Return human-friendly power / dB label."""
+        if cfg.kind == "relative":
+            if not np.isfinite(value_W):
+                return "— dB"
+            return f"{value_W:.2f} dB"
+
+        # power: pick (scale, unit) from the module-level table
+        v = abs(value_W)
+        for bound, scale, unit in _POWER_TABLE:
+            if v < bound:
+                break
+        return f"{value_W * scale:.3g} {unit}"
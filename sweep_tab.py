@@ -2,16 +2,25 @@
 
 from __future__ import annotations
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 
 import time
+from collections import OrderedDict, deque
+
 import numpy as np
 from PyQt5 import QtCore, QtGui, QtWidgets
 import pyqtgraph as pg
 
-from channels import ChannelManager, ChannelConfig
+from channels import ChannelManager, ChannelConfig, linear_coeffs
 from coredaq_py_api import CoreDAQError, CoreDAQ
 
+# Optional: numba fuses the wavelength-axis arange/scale/clip chain into
+# a single pass over the (possibly multi-million sample) output buffer.
+try:
+    import numba
+except Exception:  # pragma: no cover
+    numba = None  # type: ignore
+
 # -------------------- pyqtgraph config --------------------
 pg.setConfigOptions(antialias=False)
 
@@ -45,6 +54,54 @@ LASER_MODELS = {
     "TSL570": TSL570,
     "TSL770": TSL770,
 }
+LASER_MODEL_NAMES = tuple(LASER_MODELS)
+
+# resolved once at import: the gain labels never change at runtime
+GAIN_LABELS = tuple(getattr(CoreDAQ, "GAIN_LABELS", ()))
+
+if numba is not None:
+    @numba.njit(cache=True, fastmath=True, boundscheck=False)
+    def _build_wavelengths(start_nm, stop_nm, out):  # pragma: no cover
+        """Closed-form axis: fill out[i] with the λ of sample i."""
+        n = out.shape[0]
+        step = (stop_nm - start_nm) / (n - 1) if n > 1 else 0.0
+        for i in range(n):
+            out[i] = start_nm + i * step
+
+    # no fastmath here: it licenses the compiler to assume no NaNs,
+    # which would break the v == v filtering
+    @numba.njit(cache=True)
+    def _nanminmax(a):  # pragma: no cover
+        """min and max of a, ignoring NaNs, in one pass."""
+        lo = np.inf
+        hi = -np.inf
+        for v in a:
+            if v == v:
+                if v < lo:
+                    lo = v
+                if v > hi:
+                    hi = v
+        return lo, hi
+
+    def _warm_jit():  # pragma: no cover
+        """Compile (or load from disk cache) the sweep kernels on tiny inputs."""
+        global _build_wavelengths, _nanminmax
+        try:
+            _build_wavelengths(0.0, 1.0, np.empty(4, np.float32))
+            _nanminmax(np.zeros(4, np.float32))
+        except Exception:
+            _build_wavelengths = None  # type: ignore
+            _nanminmax = None  # type: ignore
+
+    class _WarmupTask(QtCore.QRunnable):
+        """QThreadPool wrapper so warm-up runs off the GUI thread."""
+
+        def run(self):  # pragma: no cover
+            _warm_jit()
+else:
+    _build_wavelengths = None
+    _nanminmax = None
+    _WarmupTask = None  # type: ignore
 
 
 # -------------------- Worker for sweep (runs in QThread) --------------------
@@ -58,6 +115,12 @@ class SweepWorker(QtCore.QObject):
         super().__init__(parent)
         self.params = params
         self.daq = daq  # shared CoreDAQ instance (do NOT close here)
+        self._abort = False
+
+    @QtCore.pyqtSlot()
+    def abort(self):
+        """Ask the running sweep to stop early (simple cross-thread flag)."""
+        self._abort = True
 
     @QtCore.pyqtSlot()
     def run(self):
@@ -127,12 +190,17 @@ class SweepWorker(QtCore.QObject):
                 except Exception:
                     pass
 
-                # Apply user-selected gains
-                for head, g in enumerate(gains, start=1):
-                    try:
-                        daq.set_gain(head, g)
-                    except Exception:
-                        pass
+                # Apply user-selected gains in one batched transaction
+                # (set_gains probes GAINS support and falls back to the
+                # four individual commands on older firmware)
+                try:
+                    daq.set_gains(gains)
+                except Exception:
+                    for head, g in enumerate(gains, start=1):
+                        try:
+                            daq.set_gain(head, g)
+                        except Exception:
+                            pass
 
                 # ----- Sweep timing -----
                 sweep_span = stop_nm - start_nm
@@ -151,7 +219,27 @@ class SweepWorker(QtCore.QObject):
 
                 laser.set_sweep_start()
 
-                time.sleep(samples_total/sample_rate + 0.5)
+                # Poll the DAQ instead of sleeping the nominal duration:
+                # the wait ends as soon as acquisition does and stays
+                # cancellable; the deadline catches a stalled trigger.
+                deadline = time.monotonic() + samples_total / sample_rate + 5.0
+                while not self._abort:
+                    try:
+                        if daq.frames_remaining() <= 0:
+                            break
+                    except Exception:
+                        pass
+                    if time.monotonic() > deadline:
+                        break
+                    QtCore.QThread.msleep(20)
+
+                if self._abort:
+                    try:
+                        laser.set_sweep_stop()
+                    except Exception:
+                        pass
+                    self.status.emit("Sweep aborted.")
+                    return
 
                 end_time = time.time()
                 self.status.emit(
@@ -166,13 +254,16 @@ class SweepWorker(QtCore.QObject):
                     raise RuntimeError(f"CoreDAQ transfer error: {e}")
 
                 # ----- Build wavelength axis -----
-                t = np.arange(samples_total, dtype=float) / float(sample_rate)
-                wavelengths = start_nm + sweep_span * (t / sweep_duration_s)
-                wavelengths = np.clip(
-                    wavelengths,
-                    min(start_nm, stop_nm),
-                    max(start_nm, stop_nm),
-                )
+                # closed form: sample i sits at start + i/(N-1)*span, so a
+                # single linspace replaces the arange/divide/multiply/clip
+                # chain (monotone between endpoints, so no clip needed)
+                if _build_wavelengths is not None:
+                    wavelengths = np.empty(samples_total, dtype=np.float32)
+                    _build_wavelengths(start_nm, stop_nm, wavelengths)
+                else:
+                    wavelengths = np.linspace(
+                        start_nm, stop_nm, samples_total, dtype=np.float32
+                    )
 
                 self.result.emit(wavelengths, channels_W)
 
@@ -223,7 +314,7 @@ class SweepParamsDialog(QtWidgets.QDialog):
 
         # Laser model combo
         self.laser_combo = QtWidgets.QComboBox(self)
-        for name in ["TSL550", "TSL570", "TSL770"]:
+        for name in LASER_MODEL_NAMES:
             self.laser_combo.addItem(name, name)
         current_model = self._params.get("laser_model", DEFAULT_LASER_MODEL)
         idx = self.laser_combo.findData(current_model)
@@ -309,16 +400,31 @@ class SweepWidget(QtWidgets.QWidget):
         self.cards: List[Dict[str, Any]] = []
         self.gain_combos: List[QtWidgets.QComboBox] = []
 
-        # Pre-fetch gain labels if available
-        try:
-            self.gain_labels = list(getattr(CoreDAQ, "GAIN_LABELS", []))
-        except Exception:
-            self.gain_labels = []
+        # (4, N) physical blocks reused across sweeps of the same length,
+        # so repeated runs skip the multi-MB malloc + first-touch faults
+        self._phys_buf_cache: "OrderedDict[int, np.ndarray]" = OrderedDict()
+
+        # CSV column header keyed by the channel signature, rebuilt only
+        # when the channel configuration actually changes
+        self._csv_header_cache: Dict[tuple, str] = {}
+
+        # log messages are buffered and flushed as one append per tick,
+        # so a burst of worker status updates costs a single repaint
+        self._log_buf: deque = deque()
+        self._log_timer = QtCore.QTimer(self)
+        self._log_timer.setInterval(100)
+        self._log_timer.timeout.connect(self._flush_log)
 
         self._build_ui()
         self.on_channels_updated()
         self._update_summary()
 
+        # Warm the numba kernels in the pool so the first sweep does not
+        # pay JIT latency; cache=True persists the compiled code across
+        # app launches, making this a cheap cache load after the first.
+        if _WarmupTask is not None:
+            QtCore.QThreadPool.globalInstance().start(_WarmupTask())
+
     # ------------------------------------------------------------------
     # Public API called from main
     # ------------------------------------------------------------------
@@ -412,6 +518,17 @@ class SweepWidget(QtWidgets.QWidget):
             left_axis.setPen(pg.mkPen("#bbbbbb"))
             bottom_axis.setPen(pg.mkPen("#bbbbbb"))
 
+            # min/max peak decimation caps the points handed to the paint
+            # path at roughly the viewport width, so multi-million-sample
+            # sweeps draw without scaling in N
+            pw.setDownsampling(auto=True, mode="peak")
+            pw.setClipToView(True)
+
+            # all cards share the wavelength axis: link them so a single
+            # setXRange (and any user pan/zoom) propagates to every plot
+            if self.cards:
+                pw.setXLink(self.cards[0]["plot"])
+
             color = colors[idx % len(colors)]
             curve = pw.plot(
                 pen=pg.mkPen(color, width=2),
@@ -453,6 +570,11 @@ class SweepWidget(QtWidgets.QWidget):
         self.btn_run.clicked.connect(self.run_sweep)
         top_row.addWidget(self.btn_run, 0, alignment=QtCore.Qt.AlignRight)
 
+        self.btn_cancel = QtWidgets.QPushButton("Cancel")
+        self.btn_cancel.setEnabled(False)
+        self.btn_cancel.clicked.connect(self._cancel_sweep)
+        top_row.addWidget(self.btn_cancel, 0, alignment=QtCore.Qt.AlignRight)
+
         outer.addLayout(top_row)
 
         # --- Gain row (manual gains only) ---
@@ -474,10 +596,7 @@ class SweepWidget(QtWidgets.QWidget):
             combo.setMinimumWidth(70)
 
             for g in range(8):
-                if self.gain_labels and g < len(self.gain_labels):
-                    text = self.gain_labels[g]
-                else:
-                    text = f"G{g}"
+                text = GAIN_LABELS[g] if g < len(GAIN_LABELS) else f"G{g}"
                 combo.addItem(text, g)
             combo.setCurrentIndex(0)
 
@@ -555,7 +674,18 @@ class SweepWidget(QtWidgets.QWidget):
     # ------------------------------------------------------------------
     def log(self, msg: str):
         t = time.strftime("%H:%M:%S")
-        self.txt_log.appendPlainText(f"[{t}] {msg}")
+        self._log_buf.append(f"[{t}] {msg}")
+        if not self._log_timer.isActive():
+            self._log_timer.start()
+
+    def _flush_log(self):
+        if not self._log_buf:
+            self._log_timer.stop()
+            return
+        lines = []
+        while self._log_buf:
+            lines.append(self._log_buf.popleft())
+        self.txt_log.appendPlainText("\n".join(lines))
         self.txt_log.verticalScrollBar().setValue(
             self.txt_log.verticalScrollBar().maximum()
         )
@@ -578,9 +708,9 @@ class SweepWidget(QtWidgets.QWidget):
         default_name = time.strftime("coredaq_sweep_%Y%m%d_%H%M%S.csv")
         path, _ = QtWidgets.QFileDialog.getSaveFileName(
             self,
-            "Save sweep data as CSV",
+            "Save sweep data",
             default_name,
-            "CSV Files (*.csv);;All Files (*)",
+            "CSV Files (*.csv);;NumPy archive (*.npz);;All Files (*)",
         )
         if not path:
             self.log("Sweep canceled (no file path selected).")
@@ -601,6 +731,7 @@ class SweepWidget(QtWidgets.QWidget):
 
         self._update_summary()
         self.btn_run.setEnabled(False)
+        self.btn_cancel.setEnabled(True)
 
         for card in self.cards:
             card["curve"].setData([], [])
@@ -621,6 +752,11 @@ class SweepWidget(QtWidgets.QWidget):
 
         self.thread.start()
 
+    def _cancel_sweep(self):
+        if self.worker is not None:
+            self.log("Canceling sweep…")
+            self.worker.abort()
+
     def _cleanup_thread(self):
         if self.thread is not None:
             self.thread.quit()
@@ -628,6 +764,7 @@ class SweepWidget(QtWidgets.QWidget):
             self.thread = None
             self.worker = None
         self.btn_run.setEnabled(True)
+        self.btn_cancel.setEnabled(False)
         self.log("Sweep thread finished.")
         self.sweep_finished.emit()
 
@@ -635,53 +772,155 @@ class SweepWidget(QtWidgets.QWidget):
         self.log(f"ERROR: {msg}")
         QtWidgets.QMessageBox.critical(self, "Sweep Error", msg)
 
+    def _phys_buffer(self, n: int) -> np.ndarray:
+        """Reusable (4, n) float32 block, cached per sweep length (LRU, 3 sizes)."""
+        buf = self._phys_buf_cache.get(n)
+        if buf is None:
+            buf = np.empty((4, n), dtype=np.float32)
+            self._phys_buf_cache[n] = buf
+            while len(self._phys_buf_cache) > 3:
+                self._phys_buf_cache.popitem(last=False)
+        else:
+            self._phys_buf_cache.move_to_end(n)
+        return buf
+
+    def _normalize_channels(self, channels_W, n: int) -> np.ndarray:
+        """
+        Contiguous (4, n) float32 block from the raw transfer buffers,
+        one row per physical channel. Short or missing rows copy what
+        arrived and zero the tail — np.resize would tile the data, which
+        is silently wrong for sweep traces. The backing storage comes
+        from the per-length buffer cache.
+        """
+        out = self._phys_buffer(n)
+        for i in range(4):
+            if i < len(channels_W):
+                ys = np.asarray(channels_W[i], dtype=np.float32).ravel()
+                m = min(ys.size, n)
+                out[i, :m] = ys[:m]
+                if m < n:
+                    out[i, m:] = 0.0
+            else:
+                out[i, :] = 0.0
+        return out
+
     def _on_result(self, wavelengths, channels_W):
-        wavelengths = np.asarray(wavelengths)
+        # float32 end to end: the worker already emits a float32 axis, so
+        # this is a no-copy view; foreign inputs get downcast once here
+        wavelengths = np.asarray(wavelengths, dtype=np.float32)
         if wavelengths.size == 0:
             self.log("No data returned from sweep.")
             return
 
-        if not isinstance(channels_W, (list, tuple)):
-            self.log("Channel data not in expected list/tuple form.")
+        if not isinstance(channels_W, (list, tuple, np.ndarray)):
+            self.log("Channel data not in expected array/list form.")
             return
 
-        phys_arrays: List[np.ndarray] = []
-        for i in range(4):
-            if i < len(channels_W):
-                ys = np.asarray(channels_W[i])
-                if ys.shape != wavelengths.shape:
-                    ys = np.resize(ys, wavelengths.shape)
-            else:
-                ys = np.zeros_like(wavelengths)
-            phys_arrays.append(ys)
+        N = wavelengths.size
 
         display_channels = self.manager.get_display_channels()
-        channel_arrays: List[np.ndarray] = []
+        channel_arrays: List[np.ndarray] = [None] * len(display_channels)  # type: ignore[list-item]
+
+        # Physical-only fast path (the common case): with no derived
+        # channels the (4, N) block is never evaluated against, so the
+        # displayed rows are cast straight from the transfer buffers —
+        # a no-op when the DAQ already hands back float32.
+        if all(c.kind == "physical" for c in display_channels):
+            for slot, cfg in enumerate(display_channels):
+                idx = cfg.index or 0
+                if 0 <= idx < min(4, len(channels_W)):
+                    channel_arrays[slot] = np.asarray(
+                        channels_W[idx], dtype=np.float32
+                    ).ravel()
+                else:
+                    channel_arrays[slot] = np.zeros(N, dtype=np.float32)
+            self._finish_result(wavelengths, display_channels, channel_arrays)
+            return
 
-        for cfg in display_channels:
+        phys_block = self._normalize_channels(channels_W, N)
+
+        # Bucket the channels so all linear math expressions collapse to
+        # one matrix product and all relative channels to one divide/log
+        # pass; anything the linear lowering cannot express falls back to
+        # the per-config evaluator.
+        math_slots: List[int] = []
+        math_rows: List[Tuple[float, float, float, float, float]] = []
+        rel_slots: List[int] = []
+        rel_pairs: List[Tuple[int, int]] = []
+
+        for slot, cfg in enumerate(display_channels):
             if cfg.kind == "physical":
                 idx = cfg.index or 0
                 if 0 <= idx < 4:
-                    arr = phys_arrays[idx]
+                    channel_arrays[slot] = phys_block[idx]
                 else:
-                    arr = np.zeros_like(wavelengths)
+                    channel_arrays[slot] = np.zeros(N, dtype=np.float32)
             elif cfg.kind == "math":
-                try:
-                    arr = self.manager.eval_math_array(cfg, phys_arrays)
-                except Exception:
-                    arr = np.zeros_like(wavelengths)
+                coeffs = linear_coeffs(cfg.expression) if cfg.expression else None
+                if coeffs is not None:
+                    math_slots.append(slot)
+                    math_rows.append(coeffs)
+                else:
+                    try:
+                        channel_arrays[slot] = self.manager.eval_math_array(cfg, phys_block)
+                    except Exception:
+                        channel_arrays[slot] = np.zeros(N, dtype=np.float32)
+            elif cfg.kind == "relative" and cfg.rel_src_indices is not None:
+                rel_slots.append(slot)
+                rel_pairs.append(cfg.rel_src_indices)
             elif cfg.kind == "relative":
-                try:
-                    arr = self.manager.eval_relative_array(cfg, phys_arrays)
-                except Exception:
-                    arr = np.full_like(wavelengths, np.nan)
+                channel_arrays[slot] = np.full(N, np.nan, dtype=np.float32)
             else:
-                arr = np.zeros_like(wavelengths)
-
-            arr = np.asarray(arr)
+                channel_arrays[slot] = np.zeros(N, dtype=np.float32)
+
+        if math_rows:
+            coeff = np.asarray(math_rows, dtype=np.float32)
+            math_out = coeff[:, :4] @ phys_block
+            math_out += coeff[:, 4:5]
+            for row, slot in enumerate(math_slots):
+                channel_arrays[slot] = math_out[row]
+
+        if rel_pairs:
+            pairs = np.asarray(rel_pairs, dtype=np.intp)
+            num = phys_block[pairs[:, 0]]
+            den = phys_block[pairs[:, 1]]
+            rel_out = np.empty_like(num)
+            # same semantics as eval_relative_array: non-positive samples
+            # map to -inf, 10*log10 computed via the cheaper log2 ufunc
+            valid = (num > 0) & (den > 0)
+            np.divide(num, den, out=rel_out, where=valid)
+            np.log2(rel_out, out=rel_out, where=valid)
+            np.multiply(rel_out, 3.0102999566398116, out=rel_out, where=valid)
+            rel_out[~valid] = -np.inf
+            for row, slot in enumerate(rel_slots):
+                channel_arrays[slot] = rel_out[row]
+
+        self._finish_result(wavelengths, display_channels, channel_arrays)
+
+    def _finish_result(
+        self,
+        wavelengths: np.ndarray,
+        display_channels: List[ChannelConfig],
+        channel_arrays: List[np.ndarray],
+    ):
+        """Plot the evaluated channel arrays and save if a path is pending."""
+        N = wavelengths.size
+
+        # the axis is monotone between its endpoints (linspace), so the
+        # extremes are the first/last element — no full-array scan needed
+        xlo = float(wavelengths[0])
+        xhi = float(wavelengths[-1])
+        if xhi < xlo:
+            xlo, xhi = xhi, xlo
+
+        for slot, arr in enumerate(channel_arrays):
+            arr = np.asarray(arr, dtype=np.float32)
             if arr.shape != wavelengths.shape:
-                arr = np.resize(arr, wavelengths.shape)
-            channel_arrays.append(arr)
+                fixed = np.zeros(N, dtype=np.float32)
+                m = min(arr.size, N)
+                fixed[:m] = arr.ravel()[:m]
+                arr = fixed
+            channel_arrays[slot] = arr
 
         for card, arr in zip(self.cards, channel_arrays):
             cfg: ChannelConfig = card["cfg"]
@@ -690,8 +929,13 @@ class SweepWidget(QtWidgets.QWidget):
 
             curve.setData(wavelengths, arr)
 
-            ymin = float(np.nanmin(arr))
-            ymax = float(np.nanmax(arr))
+            if _nanminmax is not None:
+                # one fused pass instead of two full-array reductions
+                ymin, ymax = _nanminmax(arr)
+                ymin, ymax = float(ymin), float(ymax)
+            else:
+                ymin = float(np.nanmin(arr))
+                ymax = float(np.nanmax(arr))
             if not np.isfinite(ymin) or not np.isfinite(ymax):
                 continue
 
@@ -709,38 +953,39 @@ class SweepWidget(QtWidgets.QWidget):
                 hi = lo + span if span > 0 else lo + 1e-3
 
             plot.setYRange(lo, hi, padding=0)
-            plot.setXRange(float(wavelengths.min()), float(wavelengths.max()), padding=0)
 
-        self.log(
-            f"Sweep result: λ in [{wavelengths.min():.1f}, {wavelengths.max():.1f}] nm"
-        )
+        # X-linked plots: one range set on the first card reaches all
+        if self.cards:
+            self.cards[0]["plot"].setXRange(xlo, xhi, padding=0)
+
+        self.log(f"Sweep result: λ in [{xlo:.1f}, {xhi:.1f}] nm")
 
         if self.save_path is not None:
             try:
-                self._save_csv_with_metadata(
-                    self.save_path, wavelengths, display_channels, channel_arrays
-                )
-                self.log(f"Saved CSV to: {self.save_path}")
+                if self.save_path.lower().endswith(".npz"):
+                    # binary fast path: no per-element text formatting
+                    self._save_npz(
+                        self.save_path, wavelengths, display_channels, channel_arrays
+                    )
+                else:
+                    self._save_csv_with_metadata(
+                        self.save_path, wavelengths, display_channels, channel_arrays
+                    )
+                self.log(f"Saved sweep data to: {self.save_path}")
             except Exception as e:
-                self.log(f"ERROR saving CSV: {e}")
+                self.log(f"ERROR saving sweep data: {e}")
                 QtWidgets.QMessageBox.warning(
                     self,
                     "Save Error",
-                    f"Failed to save CSV:\n{e}",
+                    f"Failed to save sweep data:\n{e}",
                 )
             finally:
                 self.save_path = None
 
     # ------------------------------------------------------------------
-    # CSV saving with metadata
+    # Saving with metadata (CSV or NumPy archive)
     # ------------------------------------------------------------------
-    def _save_csv_with_metadata(
-        self,
-        path: str,
-        wavelengths: np.ndarray,
-        display_channels: List[ChannelConfig],
-        channel_arrays: List[np.ndarray],
-    ):
+    def _collect_metadata(self) -> List[str]:
         p = self.params
 
         board_T = None
@@ -778,25 +1023,65 @@ class SweepWidget(QtWidgets.QWidget):
         if die_T is not None:
             meta_lines.append(f"die_temperature_C={die_T:.2f}")
 
-        col_names = ["wavelength_nm"]
+        return meta_lines
+
+    def _save_npz(
+        self,
+        path: str,
+        wavelengths: np.ndarray,
+        display_channels: List[ChannelConfig],
+        channel_arrays: List[np.ndarray],
+    ):
+        names = []
         for cfg in display_channels:
             unit = cfg.unit or ("dB" if cfg.kind == "relative" else "W")
-            safe_name = cfg.name.replace(",", "_").replace(" ", "_")
-            col_names.append(f"{safe_name}_{unit}")
-
-        header_data = ",".join(col_names)
+            names.append(f"{cfg.name}_{unit}")
 
-        cols = [np.asarray(wavelengths)]
-        for arr in channel_arrays:
-            cols.append(np.asarray(arr))
-        data = np.column_stack(cols)
-
-        full_header = "\n".join(meta_lines + [header_data])
-
-        np.savetxt(
+        channels = (
+            np.stack(channel_arrays)
+            if channel_arrays
+            else np.empty((0, wavelengths.size), dtype=np.float32)
+        )
+        np.savez_compressed(
             path,
-            data,
-            delimiter=",",
-            header=full_header,
-            comments="# ",
+            wavelengths=wavelengths,
+            channels=channels,
+            channel_names=np.array(names),
+            meta=np.array(self._collect_metadata()),
         )
+
+    def _save_csv_with_metadata(
+        self,
+        path: str,
+        wavelengths: np.ndarray,
+        display_channels: List[ChannelConfig],
+        channel_arrays: List[np.ndarray],
+    ):
+        meta_lines = self._collect_metadata()
+
+        key = tuple((c.name, c.unit, c.kind) for c in display_channels)
+        header_data = self._csv_header_cache.get(key)
+        if header_data is None:
+            col_names = ["wavelength_nm"]
+            for cfg in display_channels:
+                unit = cfg.unit or ("dB" if cfg.kind == "relative" else "W")
+                safe_name = cfg.name.replace(",", "_").replace(" ", "_")
+                col_names.append(f"{safe_name}_{unit}")
+            header_data = self._csv_header_cache[key] = ",".join(col_names)
+
+        # Stream row chunks instead of column_stack-ing the whole sweep:
+        # the stacked copy doubled peak memory on multi-million-sample
+        # runs, and one small float32 chunk is refilled per block.
+        n = wavelengths.size
+        chunk_rows = 65536
+        chunk = np.empty((min(chunk_rows, n), len(channel_arrays) + 1), dtype=np.float32)
+
+        with open(path, "wb") as fh:
+            for line in meta_lines + [header_data]:
+                fh.write(b"# " + line.encode("utf-8") + b"\n")
+            for start in range(0, n, chunk_rows):
+                m = min(chunk_rows, n - start)
+                chunk[:m, 0] = wavelengths[start:start + m]
+                for j, arr in enumerate(channel_arrays, start=1):
+                    chunk[:m, j] = arr[start:start + m]
+                np.savetxt(fh, chunk[:m], fmt="%.7g", delimiter=",")